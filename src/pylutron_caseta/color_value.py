@@ -1,60 +1,69 @@
 """Types for specifying colors."""
 
-from abc import ABC, abstractmethod
 from typing import Optional
 
 
-class ColorMode(ABC):
+def _color_status(zone_status: Optional[dict]) -> Optional[dict]:
+    """Get the color tuning status from a zone status, if there is one."""
+    if zone_status is None:
+        return None
+    return zone_status.get("ColorTuningStatus")
+
+
+def get_color_from_leap(zone_status: dict) -> Optional["ColorMode"]:
+    """
+    Get the color value from the zone status.
+
+    Returns None if no color is set.
+
+    :param zone_status: leap zone status dictionary
+    :return: color value
+    """
+    color_status = _color_status(zone_status)
+    if color_status is None:
+        return None
+
+    white_tuning_level = color_status.get("WhiteTuningLevel")
+    if white_tuning_level is not None:
+        return WarmCoolColorValue(white_tuning_level["Kelvin"])
+
+    hsv_tuning_level = color_status.get("HSVTuningLevel")
+    if hsv_tuning_level is not None:
+        return FullColorValue(hsv_tuning_level["Hue"], hsv_tuning_level["Saturation"])
+
+    return None
+
+
+class ColorMode:
     """A color for spectrum tune or white tune lights."""
 
-    @abstractmethod
+    __slots__ = ()
+
     def get_spectrum_tuning_level_parameters(self) -> dict:
         """
         Get the relevant parameter dictionary for the spectrum tuning level.
 
         :return: spectrum tuning level parameter dictionary
         """
+        raise NotImplementedError
 
-    @abstractmethod
     def get_white_tuning_level_parameters(self) -> dict:
         """
         Get the relevant parameter dictionary for the white tuning level.
 
         :return: white tuning level parameter dictionary
         """
+        raise NotImplementedError
 
-    @staticmethod
-    def get_color_from_leap(zone_status: dict) -> Optional["ColorMode"]:
-        """
-        Get the color value from the zone status.
-
-        Returns None if no color is set.
-
-        :param zone_status: leap zone status dictionary
-        :return: color value
-        """
-        if zone_status is None:
-            return None
-
-        color_status = zone_status.get("ColorTuningStatus")
-        if color_status is None:
-            return None
-
-        if "WhiteTuningLevel" in color_status:
-            kelvin = color_status["WhiteTuningLevel"]["Kelvin"]
-            return WarmCoolColorValue(kelvin)
-
-        if "HSVTuningLevel" in color_status:
-            hue = color_status["HSVTuningLevel"]["Hue"]
-            saturation = color_status["HSVTuningLevel"]["Saturation"]
-            return FullColorValue(hue, saturation)
-
-        return None
+    # kept for compatibility with callers of ColorMode.get_color_from_leap
+    get_color_from_leap = staticmethod(get_color_from_leap)
 
 
 class FullColorValue(ColorMode):
     """A color specified as hue+saturation."""
 
+    __slots__ = ("hue", "saturation")
+
     def __init__(self, hue: int, saturation: int):
         """
         Create a Full Color value.
@@ -62,8 +71,8 @@ class FullColorValue(ColorMode):
         :param hue: Hue of the bulb
         :param saturation: Saturation of the bulb
         """
-        self.hue = hue
-        self.saturation = saturation
+        self.hue: int = hue
+        self.saturation: int = saturation
 
     def get_spectrum_tuning_level_parameters(self) -> dict:
         return {"ColorTuningStatus": self.get_white_tuning_level_parameters()}
@@ -75,13 +84,15 @@ class FullColorValue(ColorMode):
 class WarmCoolColorValue(ColorMode):
     """A color temperature."""
 
+    __slots__ = ("kelvin",)
+
     def __init__(self, kelvin: int):
         """
         Create a Warm Cool color value.
 
         :param kelvin: kelvin value of the bulb
         """
-        self.kelvin = kelvin
+        self.kelvin: int = kelvin
 
     def get_spectrum_tuning_level_parameters(self) -> dict:
         return {"ColorTuningStatus": self.get_white_tuning_level_parameters()}
@@ -97,10 +108,12 @@ class WarmDimmingColorValue:
     :param enabled: enable warm dimming
     """
 
+    __slots__ = ("enabled", "additional_params")
+
     def __init__(self, enabled: bool, additional_params: Optional[dict] = None):
         """Create a Warm Dimming value."""
-        self.enabled = enabled
-        self.additional_params = additional_params or {}
+        self.enabled: bool = enabled
+        self.additional_params: dict = additional_params or {}
 
     @staticmethod
     def get_warm_dim_from_leap(zone_status: dict) -> Optional["bool"]:
@@ -109,10 +122,7 @@ class WarmDimmingColorValue:
 
         Returns None if the zone status does not contain warm dimming information.
         """
-        if zone_status is None:
-            return None
-
-        color_status = zone_status.get("ColorTuningStatus")
+        color_status = _color_status(zone_status)
         if color_status is None:
             return None
 
@@ -1,9 +1,10 @@
 """LEAP protocol layer."""
 
 import asyncio
+import functools
+import itertools
 import logging
 import re
-import uuid
 from typing import Callable, Dict, List, Optional, Tuple
 
 import orjson
@@ -13,10 +14,8 @@ from .messages import Response
 
 _LOG = logging.getLogger(__name__)
 _DEFAULT_LIMIT = 2**18
-
-
-def _make_tag() -> str:
-    return str(uuid.uuid4())
+# keeps generated client tags apart from tags chosen by callers
+_TAG_PREFIX = "pylutron-"
 
 
 class LeapProtocol:
@@ -32,7 +31,21 @@ class LeapProtocol:
         self._writer = writer
         self._in_flight_requests: Dict[str, "asyncio.Future[Response]"] = {}
         self._tagged_subscriptions: Dict[str, Callable[[Response], None]] = {}
-        self._unsolicited_subs: List[Callable[[Response], None]] = []
+        self._unsolicited_subs: Tuple[Callable[[Response], None], ...] = ()
+        self._tag_counter = itertools.count(1)
+        self._pending_writes: List[bytes] = []
+        self._pending_tags: List[str] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+
+    def _make_tag(self) -> str:
+        # skip tags the caller has already chosen for itself
+        while True:
+            tag = f"{_TAG_PREFIX}{next(self._tag_counter):x}"
+            if (
+                tag not in self._in_flight_requests
+                and tag not in self._tagged_subscriptions
+            ):
+                return tag
 
     async def request(
         self,
@@ -44,7 +57,7 @@ class LeapProtocol:
     ) -> Response:
         """Make a request to the bridge and return the response."""
         if tag is None:
-            tag = _make_tag()
+            tag = self._make_tag()
 
         future: asyncio.Future = asyncio.get_running_loop().create_future()
 
@@ -70,13 +83,40 @@ class LeapProtocol:
 
         try:
             text = orjson.dumps(cmd)
-            _LOG.debug("sending %s", text)
-            self._writer.writelines((text, b"\r\n"))
+            self._pending_writes += (text, b"\r\n")
+            self._pending_tags.append(tag)
+            if self._flush_handle is None:
+                self._flush_handle = asyncio.get_running_loop().call_soon(self._flush)
 
             return await future
         finally:
             self._in_flight_requests.pop(tag, None)
 
+    def _flush(self):
+        """Write all frames queued since the last flush in a single call."""
+        self._flush_handle = None
+        if not self._pending_writes:
+            return
+
+        pending = self._pending_writes
+        tags = self._pending_tags
+        self._pending_writes = []
+        self._pending_tags = []
+        try:
+            self._writer.writelines(pending)
+        except Exception as exc:  # pylint: disable=broad-except
+            # the requests are waiting on responses that will never come
+            for tag in tags:
+                future = self._in_flight_requests.get(tag)
+                if future is not None and not future.done():
+                    future.set_exception(exc)
+            return
+
+        if _LOG.isEnabledFor(logging.DEBUG):
+            # frames alternate with their line terminators
+            for text in pending[::2]:
+                _LOG.debug("sent %s", text)
+
     async def run(self):
         """Event monitoring loop."""
         while not self._reader.at_eof():
@@ -92,14 +132,16 @@ class LeapProtocol:
                 if tag is not None:
                     in_flight = self._in_flight_requests.pop(tag, None)
                     if in_flight is not None and not in_flight.done():
-                        _LOG.debug("received: %s", resp_json)
+                        if _LOG.isEnabledFor(logging.DEBUG):
+                            _LOG.debug("received: %s", resp_json)
                         in_flight.set_result(Response.from_json(resp_json))
                     else:
                         subscription = self._tagged_subscriptions.get(tag, None)
                         if subscription is not None:
-                            _LOG.debug(
-                                "received for subscription %s: %s", tag, resp_json
-                            )
+                            if _LOG.isEnabledFor(logging.DEBUG):
+                                _LOG.debug(
+                                    "received for subscription %s: %s", tag, resp_json
+                                )
                             subscription(Response.from_json(resp_json))
                         else:
                             _LOG.error(
@@ -108,7 +150,8 @@ class LeapProtocol:
                                 resp_json,
                             )
                 else:
-                    _LOG.debug("Received message with no tag: %s", resp_json)
+                    if _LOG.isEnabledFor(logging.DEBUG):
+                        _LOG.debug("Received message with no tag: %s", resp_json)
                     obj = Response.from_json(resp_json)
                     for handler in self._unsolicited_subs:
                         try:
@@ -140,7 +183,7 @@ class LeapProtocol:
             raise TypeError("callback must be callable")
 
         if tag is None:
-            tag = _make_tag()
+            tag = self._make_tag()
 
         response = await self.request(communique_type, url, body, tag=tag)
 
@@ -160,14 +203,21 @@ class LeapProtocol:
         """
         if not callable(callback):
             raise TypeError("callback must be callable")
-        self._unsolicited_subs.append(callback)
+        self._unsolicited_subs += (callback,)
 
     def unsubscribe_unsolicited(self, callback: Callable[[Response], None]):
         """Unsubscribe from notifications of unsolicited events."""
-        self._unsolicited_subs.remove(callback)
+        subs = list(self._unsolicited_subs)
+        subs.remove(callback)
+        self._unsolicited_subs = tuple(subs)
 
     def close(self):
         """Disconnect."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending_writes.clear()
+        self._pending_tags.clear()
         self._writer.close()
 
         for request in self._in_flight_requests.values():
@@ -192,6 +242,8 @@ async def open_connection(
 _HREFRE = re.compile(r"/(?:\D+)/(\d+)(?:\/\D+)?")
 
 
+# a bridge has a bounded set of hrefs, and the same ones are parsed on every status
+@functools.lru_cache(maxsize=1024)
 def id_from_href(href: str) -> str:
     """Get an id from any kind of href.
 
@@ -1,30 +1,53 @@
 """Models for messages exchanged with the bridge."""
 
-from typing import NamedTuple, Optional
-
+from typing import Dict, NamedTuple, Optional
 
 class ResponseStatus:
-    """A response status split into its code and message parts."""
+    """
+    A response status split into its code and message parts.
+
+    Instances are immutable, so common statuses can be shared between responses.
+    """
+
+    __slots__ = ("_code", "_message")
 
     def __init__(self, code: Optional[int], message: str):
         """Create a new ResponseStatus."""
-        self.code = code
-        self.message = message
+        self._code = code
+        self._message = message
+
+    @property
+    def code(self) -> Optional[int]:
+        """Get the numeric status code, if there is one."""
+        return self._code
+
+    @property
+    def message(self) -> str:
+        """Get the status message."""
+        return self._message
 
     @classmethod
     def from_str(cls, data: str) -> "ResponseStatus":
-        """Convert a str to a ResponseStatus."""
-        space = data.find(" ")
-        if space == -1:
-            code = None
-        else:
+        """
+        Convert a str to a ResponseStatus.
+
+        Common statuses are shared between responses.
+        """
+        status = _COMMON_STATUSES.get(data)
+        if status is not None:
+            return status
+
+        code_str, space, rest = data.partition(" ")
+        code = None
+        message = data
+        if space:
             try:
-                code = int(data[:space])
-                data = data[space + 1 :]
+                code = int(code_str)
+                message = rest
             except ValueError:
-                code = None
+                pass
 
-        return ResponseStatus(code, data)
+        return ResponseStatus(code, message)
 
     def is_successful(self) -> bool:
         """Check if the status code is in the range [200, 300)."""
@@ -47,6 +70,14 @@ class ResponseStatus:
         )
 
 
+# nearly every response carries one of these, so they are parsed once and shared
+_COMMON_STATUSES: Dict[str, ResponseStatus] = {
+    "200 OK": ResponseStatus(200, "OK"),
+    "201 Created": ResponseStatus(201, "Created"),
+    "204 NoContent": ResponseStatus(204, "NoContent"),
+}
+
+
 class ResponseHeader(NamedTuple):
     """A LEAP response header."""
 
@@ -1,6 +1,7 @@
 """Provides an API to interact with the Lutron Caseta Smart Bridge & RA3 Processor."""
 
 import asyncio
+import functools
 import logging
 import math
 import socket
@@ -8,7 +9,7 @@ import ssl
 from datetime import timedelta
 from typing import Callable, Dict, List, Optional, Tuple, Union, Coroutine, Any
 
-from .color_value import ColorMode, WarmDimmingColorValue
+from .color_value import ColorMode, WarmDimmingColorValue, get_color_from_leap
 
 
 try:
@@ -38,6 +39,8 @@ CONNECT_TIMEOUT = 5.0
 REQUEST_TIMEOUT = 5.0
 RECONNECT_DELAY = 2.0
 
+_SENSOR_TYPES = frozenset(_LEAP_DEVICE_TYPES["sensor"])
+
 
 class Smartbridge:
     """
@@ -69,6 +72,10 @@ class Smartbridge:
         self._leap: Optional[LeapProtocol] = None
         self._monitor_task: Optional[asyncio.Task] = None
         self._ping_task: Optional[asyncio.Task] = None
+        self._unsolicited_read_handlers: Dict[str, Callable[[Response], None]] = {
+            "OneZoneStatus": self._handle_one_zone_status,
+            "OneLEDStatus": self._handle_button_led_status,
+        }
 
     @property
     def logged_in(self):
@@ -266,9 +273,9 @@ class Smartbridge:
         :param device_id: device id, e.g. 5
         :returns True if level is greater than 0 level, False otherwise
         """
+        device = self.devices[device_id]
         return (
-            self.devices[device_id]["current_state"] > 0
-            or (self.devices[device_id]["fan_speed"] or FAN_OFF) != FAN_OFF
+            device["current_state"] > 0 or (device["fan_speed"] or FAN_OFF) != FAN_OFF
         )
 
     async def _request(
@@ -662,7 +669,8 @@ class Smartbridge:
                 self._leap = None
 
     def _handle_one_zone_status(self, response: Response):
-        _LOG.debug("Handling single zone status: %s", response)
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("Handling single zone status: %s", response)
         body = response.Body
         if body is None:
             return
@@ -673,10 +681,11 @@ class Smartbridge:
         level = status.get("Level", -1)
         fan_speed = status.get("FanSpeed", None)
         tilt = status.get("Tilt", None)
-        color = ColorMode.get_color_from_leap(status)
+        color = get_color_from_leap(status)
         warm_dim = WarmDimmingColorValue.get_warm_dim_from_leap(status)
 
-        _LOG.debug("zone=%s level=%s", zone, level)
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("zone=%s level=%s", zone, level)
         device = self.get_device_by_zone_id(zone)
         if level >= 0:
             device["current_state"] = level
@@ -693,7 +702,8 @@ class Smartbridge:
             self._subscribers[device["device_id"]]()
 
     def _handle_button_status(self, response: Response):
-        _LOG.debug("Handling button status: %s", response)
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("Handling button status: %s", response)
 
         if response.Body is None:
             return
@@ -704,8 +714,9 @@ class Smartbridge:
         if button_id in self.buttons:
             self.buttons[button_id]["current_state"] = button_event
             # Notify any subscribers of the change to button status
-            if button_id in self._button_subscribers:
-                self._button_subscribers[button_id](button_event)
+            callback = self._button_subscribers.get(button_id)
+            if callback is not None:
+                callback(button_event)
 
     def _handle_button_led_status(self, response: Response):
         """
@@ -713,7 +724,8 @@ class Smartbridge:
 
         :param response: processor response with event
         """
-        _LOG.debug("Handling button LED status: %s", response)
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("Handling button LED status: %s", response)
 
         if response.Body is None:
             return
@@ -729,7 +741,8 @@ class Smartbridge:
                 self._subscribers[button_led_id]()
 
     def _handle_multi_zone_status(self, response: Response):
-        _LOG.debug("Handling multi zone status: %s", response)
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("Handling multi zone status: %s", response)
 
         if response.Body is None:
             return
@@ -738,7 +751,8 @@ class Smartbridge:
             self._handle_zone_status(zonestatus)
 
     def _handle_occupancy_group_status(self, response: Response):
-        _LOG.debug("Handling occupancy group status: %s", response)
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("Handling occupancy group status: %s", response)
 
         if response.Body is None:
             return
@@ -763,7 +777,8 @@ class Smartbridge:
                 self._occupancy_subscribers[occgroup_id]()
 
     def _handle_ra3_occupancy_group_status(self, response: Response):
-        _LOG.debug("Handling ra3 occupancy status: %s", response)
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("Handling ra3 occupancy status: %s", response)
 
         if response.Body is None:
             return
@@ -794,16 +809,13 @@ class Smartbridge:
                     self._occupancy_subscribers[occgroup_id]()
 
     def _handle_unsolicited(self, response: Response):
-        if (
-            response.CommuniqueType == "ReadResponse"
-            and response.Header.MessageBodyType == "OneZoneStatus"
-        ):
-            self._handle_one_zone_status(response)
-        elif (
-            response.CommuniqueType == "ReadResponse"
-            and response.Header.MessageBodyType == "OneLEDStatus"
-        ):
-            self._handle_button_led_status(response)
+        body_type = response.Header.MessageBodyType
+        if response.CommuniqueType != "ReadResponse" or body_type is None:
+            return
+
+        handler = self._unsolicited_read_handlers.get(body_type)
+        if handler is not None:
+            handler(response)
 
     async def _login(self):
         """Connect and login to the Smart Bridge LEAP server using SSL."""
@@ -1002,7 +1014,7 @@ class Smartbridge:
         device_type = device_json["Device"]["DeviceType"]
 
         # ignore non-button devices
-        if device_type not in _LEAP_DEVICE_TYPES.get("sensor"):
+        if device_type not in _SENSOR_TYPES:
             return
 
         button_group_json = await self._request(
@@ -1442,6 +1454,8 @@ class Smartbridge:
             self._ping_task.cancel()
 
 
+# callers tend to reuse a handful of fade and delay times
+@functools.lru_cache(maxsize=128)
 def _format_duration(duration: timedelta) -> str:
     """Convert a timedelta to the hh:mm:ss format used in LEAP."""
     total_seconds = math.floor(duration.total_seconds())
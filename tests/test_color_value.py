@@ -0,0 +1,59 @@
+"""Tests for color value types."""
+from pylutron_caseta.color_value import (
+    FullColorValue,
+    WarmCoolColorValue,
+    WarmDimmingColorValue,
+)
+
+
+def test_full_color_parameters():
+    """Test that full color parameters are built fresh from the current value."""
+    color = FullColorValue(10, 20)
+
+    white = color.get_white_tuning_level_parameters()
+    assert white == {"HSVTuningLevel": {"Hue": 10, "Saturation": 20}}
+    white["HSVTuningLevel"]["Hue"] = 99
+    assert color.get_white_tuning_level_parameters() == {
+        "HSVTuningLevel": {"Hue": 10, "Saturation": 20}
+    }
+
+    color.hue = 30
+    assert color.get_spectrum_tuning_level_parameters() == {
+        "ColorTuningStatus": {"HSVTuningLevel": {"Hue": 30, "Saturation": 20}}
+    }
+
+
+def test_warm_cool_parameters():
+    """Test that warm cool parameters are built fresh from the current value."""
+    color = WarmCoolColorValue(2700)
+
+    white = color.get_white_tuning_level_parameters()
+    assert white == {"WhiteTuningLevel": {"Kelvin": 2700}}
+    white["WhiteTuningLevel"]["Kelvin"] = 5000
+    assert color.get_white_tuning_level_parameters() == {
+        "WhiteTuningLevel": {"Kelvin": 2700}
+    }
+
+    color.kelvin = 3000
+    assert color.get_spectrum_tuning_level_parameters() == {
+        "ColorTuningStatus": {"WhiteTuningLevel": {"Kelvin": 3000}}
+    }
+
+
+def test_warm_dimming_off_parameters_not_shared():
+    """Test that changing one warm dimming command does not change the next."""
+    warm_dim = WarmDimmingColorValue(False)
+
+    white = warm_dim.get_white_tuning_level_parameters()
+    white["WarmDimParameters"]["CurveDimming"] = {"Curve": {"href": "/curve/1"}}
+    assert warm_dim.get_white_tuning_level_parameters() == {
+        "CommandType": "GoToWarmDim",
+        "WarmDimParameters": {"CurveDimming": None},
+    }
+
+    spectrum = warm_dim.get_spectrum_tuning_level_parameters()
+    spectrum["SpectrumTuningLevelParameters"].clear()
+    assert WarmDimmingColorValue(False).get_spectrum_tuning_level_parameters() == {
+        "CommandType": "GoToSpectrumTuningLevel",
+        "SpectrumTuningLevelParameters": {"ColorTuningStatus": {"CurveDimming": None}},
+    }
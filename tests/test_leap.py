@@ -9,6 +9,12 @@ import pytest_asyncio
 from pylutron_caseta import BridgeDisconnectedError
 from pylutron_caseta.leap import LeapProtocol
 from pylutron_caseta.messages import Response, ResponseHeader, ResponseStatus
+from pylutron_caseta.utils import asyncio_timeout
+
+
+def _frame(obj: dict) -> bytes:
+    """Encode a message as a LEAP frame."""
+    return orjson.dumps(obj) + b"\r\n"
 
 
 class Pipe(NamedTuple):
@@ -18,6 +24,7 @@ class Pipe(NamedTuple):
     leap_loop: asyncio.Task
     test_reader: asyncio.StreamReader
     test_writer: asyncio.StreamWriter
+    leap_transport: "_PipeTransport"
 
 
 class _PipeTransport(asyncio.Transport):
@@ -27,6 +34,17 @@ class _PipeTransport(asyncio.Transport):
         self._extra = {}
         self.other = None
         self._protocol = None
+        self._peer_data_received = None
+        # one entry per write call that reached the peer
+        self.deliveries = []
+        self.write_error = None
+
+    def link(self, other: "_PipeTransport"):
+        """Send written data to another transport, whose protocol is already set."""
+        protocol = other.get_protocol()
+        assert isinstance(protocol, asyncio.Protocol)
+        self.other = other
+        self._peer_data_received = protocol.data_received
 
     def close(self):
         self._closing = True
@@ -58,11 +76,17 @@ class _PipeTransport(asyncio.Transport):
         raise NotImplementedError()
 
     def write(self, data: bytes):
-        self.other.get_protocol().data_received(data)
+        if self.write_error is not None:
+            raise self.write_error
+        self.deliveries.append(data)
+        self._peer_data_received(data)
 
     def writelines(self, list_of_data: Iterable[bytes]):
-        for line in list_of_data:
-            self.write(line)
+        if self.write_error is not None:
+            raise self.write_error
+        data = b"".join(list_of_data)
+        self.deliveries.append(data)
+        self._peer_data_received(data)
 
     def write_eof(self):
         raise NotImplementedError()
@@ -77,29 +101,26 @@ class _PipeTransport(asyncio.Transport):
 @pytest_asyncio.fixture(name="pipe")
 async def fixture_pipe() -> AsyncGenerator[Pipe, None]:
     """Create linked readers and writers for tests."""
+    loop = asyncio.get_running_loop()
     test_reader = asyncio.StreamReader()
     impl_reader = asyncio.StreamReader()
     test_protocol = asyncio.StreamReaderProtocol(test_reader)
     impl_protocol = asyncio.StreamReaderProtocol(impl_reader)
     test_pipe = _PipeTransport()
     impl_pipe = _PipeTransport()
-    test_pipe.other = impl_pipe
-    impl_pipe.other = test_pipe
     test_pipe.set_protocol(test_protocol)
     impl_pipe.set_protocol(impl_protocol)
+    test_pipe.link(impl_pipe)
+    impl_pipe.link(test_pipe)
     test_protocol.connection_made(test_pipe)
     impl_protocol.connection_made(impl_pipe)
-    test_writer = asyncio.StreamWriter(
-        test_pipe, test_protocol, test_reader, asyncio.get_running_loop()
-    )
-    impl_writer = asyncio.StreamWriter(
-        impl_pipe, impl_protocol, impl_reader, asyncio.get_running_loop()
-    )
+    test_writer = asyncio.StreamWriter(test_pipe, test_protocol, test_reader, loop)
+    impl_writer = asyncio.StreamWriter(impl_pipe, impl_protocol, impl_reader, loop)
 
     leap = LeapProtocol(impl_reader, impl_writer)
-    leap_task = asyncio.create_task(leap.run())
+    leap_task = loop.create_task(leap.run())
 
-    yield Pipe(leap, leap_task, test_reader, test_writer)
+    yield Pipe(leap, leap_task, test_reader, test_writer, impl_pipe)
 
     leap_task.cancel()
 
@@ -123,8 +144,7 @@ async def test_call(pipe: Pipe):
         "Header": {"ClientTag": tag, "StatusCode": "200 OK", "Url": "/test"},
         "Body": {"ok": True},
     }
-    response_bytes = orjson.dumps(response_obj) + b"\r\n"
-    pipe.test_writer.write(response_bytes)
+    pipe.test_writer.write(_frame(response_obj))
 
     result = await task
 
@@ -135,6 +155,119 @@ async def test_call(pipe: Pipe):
     )
 
 
+@pytest.mark.asyncio
+async def test_explicit_and_generated_tags(pipe: Pipe):
+    """Test that generated tags never reuse a tag chosen by the caller."""
+    explicit_task = asyncio.create_task(
+        pipe.leap.request("ReadRequest", "/explicit", tag="pylutron-1")
+    )
+    explicit = orjson.loads(await pipe.test_reader.readline())
+    assert explicit["Header"]["ClientTag"] == "pylutron-1"
+
+    generated_task = asyncio.create_task(pipe.leap.request("ReadRequest", "/generated"))
+    generated = orjson.loads(await pipe.test_reader.readline())
+    assert generated["Header"]["ClientTag"] != "pylutron-1"
+
+    for message in (generated, explicit):
+        response_obj = {
+            "CommuniqueType": "ReadResponse",
+            "Header": {
+                "ClientTag": message["Header"]["ClientTag"],
+                "StatusCode": "200 OK",
+                "Url": message["Header"]["Url"],
+            },
+        }
+        pipe.test_writer.write(_frame(response_obj))
+
+    assert (await explicit_task).Header.Url == "/explicit"
+    assert (await generated_task).Header.Url == "/generated"
+
+
+@pytest.mark.asyncio
+async def test_pipelined_calls(pipe: Pipe):
+    """Test that requests issued together are all sent."""
+    tasks = [
+        asyncio.create_task(pipe.leap.request("ReadRequest", f"/test/{i}"))
+        for i in range(3)
+    ]
+
+    received = [orjson.loads(await pipe.test_reader.readline()) for _ in tasks]
+    assert [message["Header"]["Url"] for message in received] == [
+        "/test/0",
+        "/test/1",
+        "/test/2",
+    ]
+
+    for message in received:
+        response_obj = {
+            "CommuniqueType": "ReadResponse",
+            "Header": {
+                "ClientTag": message["Header"]["ClientTag"],
+                "StatusCode": "200 OK",
+                "Url": message["Header"]["Url"],
+            },
+        }
+        pipe.test_writer.write(_frame(response_obj))
+
+    results = await asyncio.gather(*tasks)
+    assert [result.Header.Url for result in results] == [
+        "/test/0",
+        "/test/1",
+        "/test/2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_pipelined_calls_coalesced(pipe: Pipe):
+    """Test that requests issued together reach the peer in one write."""
+    tasks = [
+        asyncio.create_task(pipe.leap.request("ReadRequest", f"/test/{i}"))
+        for i in range(3)
+    ]
+    received = [orjson.loads(await pipe.test_reader.readline()) for _ in tasks]
+
+    assert [message["Header"]["Url"] for message in received] == [
+        "/test/0",
+        "/test/1",
+        "/test/2",
+    ]
+    assert len(pipe.leap_transport.deliveries) == 1
+
+    for task in tasks:
+        task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_write_error(pipe: Pipe):
+    """Test that a failed write fails the requests it carried."""
+    pipe.leap_transport.write_error = ConnectionResetError()
+
+    tasks = [
+        asyncio.create_task(pipe.leap.request("ReadRequest", f"/test/{i}"))
+        for i in range(2)
+    ]
+
+    for task in tasks:
+        with pytest.raises(ConnectionResetError):
+            async with asyncio_timeout(1.0):
+                await task
+
+
+@pytest.mark.asyncio
+async def test_close_drops_pending_writes(pipe: Pipe):
+    """Test that nothing reaches the peer once the session is closed."""
+    task = asyncio.create_task(pipe.leap.request("ReadRequest", "/test"))
+    # let the request start, then close before its frame is written
+    await asyncio.sleep(0)
+    pipe.leap.close()
+
+    with pytest.raises(BridgeDisconnectedError):
+        await task
+    await asyncio.sleep(0)
+
+    assert pipe.leap_transport.deliveries == []
+
+
 @pytest.mark.asyncio
 async def test_read_eof(pipe):
     """Test reading when EOF is encountered."""
@@ -190,11 +323,11 @@ async def test_unsolicited(pipe):
         "Header": {"StatusCode": "200 OK", "Url": "/test"},
         "Body": {"Index": 0},
     }
-    response_bytes = orjson.dumps(response_dict) + b"\r\n"
-    pipe.test_writer.write(response_bytes)
+    pipe.test_writer.write(_frame(response_dict))
     response = Response.from_json(response_dict)
 
-    await asyncio.wait_for(handler2_called.wait(), 1.0)
+    async with asyncio_timeout(1.0):
+        await handler2_called.wait()
     handler2_called.clear()
 
     assert handler1_message == response, "handler1 did not receive correct message"
@@ -203,11 +336,11 @@ async def test_unsolicited(pipe):
     pipe.leap.unsubscribe_unsolicited(handler1)
 
     response_dict["Body"]["Index"] = 1
-    response_bytes = orjson.dumps(response_dict) + b"\r\n"
-    pipe.test_writer.write(response_bytes)
+    pipe.test_writer.write(_frame(response_dict))
     response = Response.from_json(response_dict)
 
-    await asyncio.wait_for(handler2_called.wait(), 1.0)
+    async with asyncio_timeout(1.0):
+        await handler2_called.wait()
 
     assert handler1_message != response, "handler1 was not unsubscribed"
     assert handler2_message == response, "handler2 did not receive correct message"
@@ -249,8 +382,7 @@ async def test_subscribe_tagged(pipe: Pipe):
         "Header": {"ClientTag": tag, "StatusCode": "200 OK", "Url": "/test"},
         "Body": {"ok": True},
     }
-    response_bytes = orjson.dumps(response_obj) + b"\r\n"
-    pipe.test_writer.write(response_bytes)
+    pipe.test_writer.write(_frame(response_obj))
 
     result, received_tag = await task
 
@@ -267,10 +399,10 @@ async def test_subscribe_tagged(pipe: Pipe):
         "Header": {"ClientTag": tag, "StatusCode": "200 OK", "Url": "/test"},
         "Body": {"ok": True},
     }
-    response_bytes = orjson.dumps(response_obj) + b"\r\n"
-    pipe.test_writer.write(response_bytes)
+    pipe.test_writer.write(_frame(response_obj))
 
-    await asyncio.wait_for(handler_called.wait(), 1.0)
+    async with asyncio_timeout(1.0):
+        await handler_called.wait()
     assert handler_message == Response(
         Header=ResponseHeader(StatusCode=ResponseStatus(200, "OK"), Url="/test"),
         CommuniqueType="ReadResponse",
@@ -294,8 +426,7 @@ async def test_subscribe_tagged_404(pipe: Pipe):
         "CommuniqueType": "SubscribeResponse",
         "Header": {"ClientTag": tag, "StatusCode": "404 Not Found", "Url": "/test"},
     }
-    response_bytes = orjson.dumps(response_obj) + b"\r\n"
-    pipe.test_writer.write(response_bytes)
+    pipe.test_writer.write(_frame(response_obj))
 
     result, _ = await task
 
@@ -0,0 +1,56 @@
+"""Tests for LEAP message models."""
+import pytest
+
+from pylutron_caseta.messages import ResponseStatus
+
+
+def test_status_from_str():
+    """Test parsing a status with a code and a message."""
+    status = ResponseStatus.from_str("404 Not Found")
+
+    assert status.code == 404
+    assert status.message == "Not Found"
+    assert str(status) == "404 Not Found"
+    assert not status.is_successful()
+
+
+def test_status_from_str_without_code():
+    """Test parsing statuses that do not start with a numeric code."""
+    status = ResponseStatus.from_str("OK")
+    assert status.code is None
+    assert status.message == "OK"
+
+    status = ResponseStatus.from_str("Bad Request")
+    assert status.code is None
+    assert status.message == "Bad Request"
+    assert not status.is_successful()
+
+
+def test_status_from_str_shared():
+    """Test that common statuses are shared and others are not."""
+    for text, code, message in (
+        ("200 OK", 200, "OK"),
+        ("201 Created", 201, "Created"),
+        ("204 NoContent", 204, "NoContent"),
+    ):
+        status = ResponseStatus.from_str(text)
+        assert ResponseStatus.from_str(text) is status
+        assert status == ResponseStatus(code, message)
+        assert status.is_successful()
+
+    status = ResponseStatus.from_str("404 Not Found")
+    assert ResponseStatus.from_str("404 Not Found") is not status
+    assert ResponseStatus.from_str("404 Not Found") == status
+
+
+def test_status_immutable():
+    """Test that a shared status cannot be changed."""
+    status = ResponseStatus.from_str("200 OK")
+
+    with pytest.raises(AttributeError):
+        status.code = 500  # type: ignore [misc]
+    with pytest.raises(AttributeError):
+        status.message = "Error"  # type: ignore [misc]
+
+    assert ResponseStatus.from_str("200 OK").code == 200
+
@@ -1,11 +1,12 @@
 """Tests to validate ssl interactions."""
 import asyncio
-from collections import defaultdict
+from collections import deque
 from datetime import timedelta
+import functools
 import orjson
 import logging
 import os
-import re
+import sys
 from typing import (
     Any,
     AsyncGenerator,
@@ -24,6 +25,7 @@ import pytest_asyncio
 
 from pylutron_caseta.leap import id_from_href
 from pylutron_caseta.messages import Response, ResponseHeader, ResponseStatus
+from pylutron_caseta.utils import asyncio_timeout
 from pylutron_caseta import (
     _LEAP_DEVICE_TYPES,
     FAN_MEDIUM,
@@ -31,7 +33,9 @@ from pylutron_caseta import (
     OCCUPANCY_GROUP_UNOCCUPIED,
     OCCUPANCY_GROUP_UNKNOWN,
     BUTTON_STATUS_PRESSED,
+    BUTTON_STATUS_RELEASED,
     BridgeDisconnectedError,
+    BridgeResponseError,
     smartbridge,
     color_value,
 )
@@ -50,11 +54,54 @@ RESPONSE_PATH = {
 }
 
 
+_RESPONSES_DIR = os.path.join(os.path.split(__file__)[0], "responses")
+_SENSOR_TYPES = frozenset(_LEAP_DEVICE_TYPES["sensor"])
+_OK_STATUS = ResponseStatus(200, "OK")
+_CREATED_STATUS = ResponseStatus(201, "Created")
+
+
+@functools.lru_cache(maxsize=None)
+def _read_response_file(filename: str) -> bytes:
+    with open(os.path.join(_RESPONSES_DIR, filename), "rb") as ifh:
+        return ifh.read()
+
+
 def response_from_json_file(filename: str) -> Response:
     """Fetch a response from a saved JSON file."""
-    responsedir = os.path.join(os.path.split(__file__)[0], "responses")
-    with open(os.path.join(responsedir, filename), "r", encoding="utf-8") as ifh:
-        return Response.from_json(orjson.loads(ifh.read()))
+    # parse on every call so tests never share (and mutate) response bodies
+    return Response.from_json(orjson.loads(_read_response_file(filename)))
+
+
+def _zone_status_response(zone_id: str, status: dict) -> Response:
+    """Build an unsolicited status update for a zone."""
+    return Response(
+        CommuniqueType="ReadResponse",
+        Header=ResponseHeader(
+            MessageBodyType="OneZoneStatus",
+            StatusCode=_OK_STATUS,
+            Url=f"/zone/{zone_id}/status",
+        ),
+        Body={"ZoneStatus": {**status, "Zone": {"href": f"/zone/{zone_id}"}}},
+    )
+
+
+def _zone_command_response(zone_id: str, level: int) -> Response:
+    """Build the response to a command that set a zone's level."""
+    return Response(
+        CommuniqueType="CreateResponse",
+        Header=ResponseHeader(
+            MessageBodyType="OneZoneStatus",
+            StatusCode=_CREATED_STATUS,
+            Url=f"/zone/{zone_id}/commandprocessor",
+        ),
+        Body={
+            "ZoneStatus": {
+                "href": f"/zone/{zone_id}/status",
+                "Level": level,
+                "Zone": {"href": f"/zone/{zone_id}"},
+            }
+        },
+    )
 
 
 class Request(NamedTuple):
@@ -66,15 +113,65 @@ class Request(NamedTuple):
     paging: Optional[dict] = None
 
 
+_PendingRequest = Tuple[Request, "asyncio.Future[Response]"]
+
+
+class _RequestQueue:
+    """
+    A minimal single-consumer stand-in for asyncio.Queue.
+
+    Putting and getting do not allocate futures unless the consumer has to wait.
+    """
+
+    def __init__(self) -> None:
+        self._items: "deque[_PendingRequest]" = deque()
+        self._not_empty = asyncio.Event()
+        self._unfinished = 0
+        self._finished = asyncio.Event()
+        self._finished.set()
+
+    async def put(self, item: _PendingRequest):
+        """Add a request."""
+        self._items.append(item)
+        self._unfinished += 1
+        self._finished.clear()
+        self._not_empty.set()
+
+    async def get(self) -> _PendingRequest:
+        """Remove and return a request, waiting for one if necessary."""
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self._items.popleft()
+
+    def clear(self) -> List[_PendingRequest]:
+        """Remove and return all waiting requests, marking them as handled."""
+        items = list(self._items)
+        self._items.clear()
+        self._unfinished -= len(items)
+        if self._unfinished == 0:
+            self._finished.set()
+        return items
+
+    def task_done(self):
+        """Mark a previously removed request as handled."""
+        if self._unfinished <= 0:
+            raise ValueError("task_done() called too many times")
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._finished.set()
+
+    async def join(self):
+        """Wait until every request that was added has been handled."""
+        await self._finished.wait()
+
+
 class _FakeLeap:
     def __init__(self) -> None:
-        self.requests: "asyncio.Queue[Tuple[Request, asyncio.Future[Response]]]" = (
-            asyncio.Queue()
-        )
+        self._loop = asyncio.get_running_loop()
+        self.requests = _RequestQueue()
         self.running = None
-        self._subscriptions: Dict[str, List[Callable[[Response], None]]] = defaultdict(
-            list
-        )
+        self._subscriptions: Dict[str, List[Callable[[Response], None]]] = {}
         self._unsolicited: List[Callable[[Response], None]] = []
 
     async def request(
@@ -85,7 +182,7 @@ class _FakeLeap:
         paging: Optional[dict] = None,
     ) -> Response:
         """Make a request to the bridge and return the response."""
-        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        future: asyncio.Future = self._loop.create_future()
         obj = Request(
             communique_type=communique_type, url=url, body=body, paging=paging
         )
@@ -103,12 +200,12 @@ class _FakeLeap:
     ) -> Tuple[Response, str]:
         """Subscribe to events from the bridge."""
         response = await self.request(communique_type, url, body)
-        self._subscriptions[url].append(callback)
+        self._subscriptions.setdefault(url, []).append(callback)
         return (response, "not-implemented")
 
     async def run(self):
         """Event monitoring loop."""
-        self.running = asyncio.get_running_loop().create_future()
+        self.running = self._loop.create_future()
         await self.running
 
     def subscribe_unsolicited(self, callback: Callable[[Response], None]):
@@ -131,7 +228,7 @@ class _FakeLeap:
         url = response.Header.Url
         if url is None:
             raise TypeError("url must not be None")
-        for handler in self._subscriptions[url]:
+        for handler in self._subscriptions.get(url, ()):
             handler(response)
 
     def close(self):
@@ -140,11 +237,25 @@ class _FakeLeap:
             self.running.set_result(None)
             self.running = None
 
-        while not self.requests.empty():
-            (_, response) = self.requests.get_nowait()
+        for _, response in self.requests.clear():
             if not response.done():
                 response.set_exception(BridgeDisconnectedError())
-            self.requests.task_done()
+
+
+class _FakeClock:
+    """A clock for the running loop that only moves when the test advances it."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        asyncio.get_running_loop().time = self.time  # type: ignore [method-assign]
+
+    def time(self) -> float:
+        """Get the current time."""
+        return self.now
+
+    def advance(self, seconds: float):
+        """Move the clock forward."""
+        self.now += seconds
 
 
 T = TypeVar("T")
@@ -186,111 +297,121 @@ class Bridge:
 
     async def initialize(self, processor=CASETA_PROCESSOR):
         """Perform the initial connection with SmartBridge."""
-        connect_task = asyncio.get_running_loop().create_task(self.target.connect())
+        loop = asyncio.get_running_loop()
+        connect_task = loop.create_task(self.target.connect())
         fake_leap = await self.connections.get()
 
         async def wait(coro: Coroutine[Any, Any, T]) -> T:
             # abort if SmartBridge reports it has finished connecting early
-            task = asyncio.get_running_loop().create_task(coro)
-            race = await asyncio.wait(
-                (connect_task, task), timeout=10, return_when=asyncio.FIRST_COMPLETED
-            )
-            done, _ = race
-            assert len(done) > 0, "operation timed out"
-            if len(done) == 1 and connect_task in done:
-                raise connect_task.exception()
-            result = await task
-            return result
-
-        if processor == CASETA_PROCESSOR:
-            await self._accept_connection(fake_leap, wait)
-        elif processor == RA3_PROCESSOR:
-            await self._accept_connection_ra3(fake_leap, wait)
-        elif processor == HWQSX_PROCESSOR:
-            await self._accept_connection_qsx(fake_leap, wait)
-
-        await connect_task
+            task = loop.create_task(coro)
+            try:
+                done, _ = await asyncio.wait(
+                    (connect_task, task), return_when=asyncio.FIRST_COMPLETED
+                )
+                if task not in done:
+                    exception = connect_task.exception()
+                    assert exception is not None, "SmartBridge connected early"
+                    raise exception
+                return task.result()
+            finally:
+                task.cancel()
+
+        # one deadline for the whole handshake rather than one per request
+        async with asyncio_timeout(30):
+            if processor == CASETA_PROCESSOR:
+                await self._accept_connection(fake_leap, wait)
+            elif processor == RA3_PROCESSOR:
+                await self._accept_connection_ra3(fake_leap, wait)
+            elif processor == HWQSX_PROCESSOR:
+                await self._accept_connection_qsx(fake_leap, wait)
+
+            await connect_task
 
         self.leap = fake_leap
         self.connections.task_done()
 
-    async def _accept_connection(self, leap, wait):
-        """Accept a connection from SmartBridge (implementation)."""
-        # Read request on /areas
-        request, response = await wait(leap.requests.get())
-        assert request == Request(communique_type="ReadRequest", url="/area")
-        response.set_result(response_from_json_file("areas.json"))
-        leap.requests.task_done()
-
-        # Read request on /project
-        request, response = await wait(leap.requests.get())
-        assert request == Request(communique_type="ReadRequest", url="/project")
-        response.set_result(response_from_json_file("project.json"))
-        leap.requests.task_done()
-
-        # Read request on /device
-        request, response = await wait(leap.requests.get())
-        assert request == Request(communique_type="ReadRequest", url="/device")
-        response.set_result(response_from_json_file("devices.json"))
-        leap.requests.task_done()
-
-        # Read request on /button
-        request, response = await wait(leap.requests.get())
-        assert request == Request(communique_type="ReadRequest", url="/button")
-        response.set_result(self.button_list_result)
-        leap.requests.task_done()
-
-        # Read request on /server/2/id
-        request, response = await wait(leap.requests.get())
-        assert request == Request(communique_type="ReadRequest", url="/server/2/id")
-        response.set_result(response_from_json_file("lip.json"))
-        leap.requests.task_done()
-
-        # Read request on /virtualbutton
+    @staticmethod
+    async def _expect(leap, wait, expected: Request, result: Response):
+        """Answer the next request from SmartBridge, which must be `expected`."""
         request, response = await wait(leap.requests.get())
-        assert request == Request(communique_type="ReadRequest", url="/virtualbutton")
-        response.set_result(response_from_json_file("scenes.json"))
+        assert request == expected
+        response.set_result(result)
         leap.requests.task_done()
 
-        # Read request on /occupancygroup
-        request, response = await wait(leap.requests.get())
-        assert request == Request(communique_type="ReadRequest", url="/occupancygroup")
-        response.set_result(self.occupancy_group_list_result)
-        leap.requests.task_done()
+    async def _run_script(self, leap, wait, script: List[Tuple[Request, Response]]):
+        """Answer a fixed sequence of requests from SmartBridge."""
+        for expected, result in script:
+            await self._expect(leap, wait, expected, result)
 
-        # Subscribe request on /occupancygroup/status
-        request, response = await wait(leap.requests.get())
-        assert request == Request(
-            communique_type="SubscribeRequest", url="/occupancygroup/status"
+    async def _accept_connection(self, leap, wait):
+        """Accept a connection from SmartBridge (implementation)."""
+        await self._run_script(
+            leap,
+            wait,
+            [
+                (
+                    Request(communique_type="ReadRequest", url="/area"),
+                    response_from_json_file("areas.json"),
+                ),
+                (
+                    Request(communique_type="ReadRequest", url="/project"),
+                    response_from_json_file("project.json"),
+                ),
+                (
+                    Request(communique_type="ReadRequest", url="/device"),
+                    response_from_json_file("devices.json"),
+                ),
+                (
+                    Request(communique_type="ReadRequest", url="/button"),
+                    self.button_list_result,
+                ),
+                (
+                    Request(communique_type="ReadRequest", url="/server/2/id"),
+                    response_from_json_file("lip.json"),
+                ),
+                (
+                    Request(communique_type="ReadRequest", url="/virtualbutton"),
+                    response_from_json_file("scenes.json"),
+                ),
+                (
+                    Request(communique_type="ReadRequest", url="/occupancygroup"),
+                    self.occupancy_group_list_result,
+                ),
+                (
+                    Request(
+                        communique_type="SubscribeRequest",
+                        url="/occupancygroup/status",
+                    ),
+                    self.occupancy_group_subscription_data_result,
+                ),
+            ],
         )
-        response.set_result(self.occupancy_group_subscription_data_result)
-        leap.requests.task_done()
 
         # Subscribe request on /button/{button}/status/event
-        for button in (
-            re.sub(r".*/", "", button["href"])
+        button_subscribe_requests = [
+            Request(
+                communique_type="SubscribeRequest",
+                url=f"/button/{id_from_href(button['href'])}/status/event",
+            )
             for button in self.button_list_result.Body.get("Buttons", [])
-        ):
-            request, response = await wait(leap.requests.get())
-            assert request == Request(
-                communique_type="SubscribeRequest", url=f"/button/{button}/status/event"
+        ]
+        for expected_request in button_subscribe_requests:
+            await self._expect(
+                leap, wait, expected_request, self.button_subscription_data_result
             )
-            response.set_result(self.button_subscription_data_result)
-            leap.requests.task_done()
 
         # Check the zone status on each zone
-        requested_zones = []
+        requested_zones = set()
         for _ in range(0, 5):
             request, response = await wait(leap.requests.get())
-            logging.info("Read %s", request)
             assert request.communique_type == "ReadRequest"
-            requested_zones.append(request.url)
+            requested_zones.add(request.url)
             response.set_result(
                 Response(
                     CommuniqueType="ReadResponse",
                     Header=ResponseHeader(
                         MessageBodyType="OneZoneStatus",
-                        StatusCode=ResponseStatus(200, "OK"),
+                        StatusCode=_OK_STATUS,
                         Url=request.url,
                     ),
                     Body={
@@ -303,14 +424,13 @@ class Bridge:
                 )
             )
             leap.requests.task_done()
-        requested_zones.sort()
-        assert requested_zones == [
+        assert requested_zones == {
             "/zone/1/status",
             "/zone/2/status",
             "/zone/3/status",
             "/zone/4/status",
             "/zone/6/status",
-        ]
+        }
 
     async def _process_station(self, result, leap, wait, bridge_type):
         if result.Body is None:
@@ -320,283 +440,185 @@ class Bridge:
 
         for station in result.Body.get("ControlStations", []):
             for device in station.get("AssociatedGangedDevices", []):
-                if device["Device"]["DeviceType"] not in _LEAP_DEVICE_TYPES.get(
-                    "sensor"
-                ):
+                ganged_device = device["Device"]
+                if ganged_device["DeviceType"] not in _SENSOR_TYPES:
                     continue
 
-                device_id = re.sub(r".*/", "", device["Device"]["href"])
-                request, response = await wait(leap.requests.get())
-                assert request == Request(
-                    communique_type="ReadRequest",
-                    url=f"/device/{device_id}/buttongroup/expanded",
-                )
+                device_id = id_from_href(ganged_device["href"])
                 button_group_result = response_from_json_file(
                     f"{response_path}device/{device_id}/buttongroup.json"
                 )
-                response.set_result(button_group_result)
-                leap.requests.task_done()
-
-                request, response = await wait(leap.requests.get())
-                assert request == Request(
-                    communique_type="ReadRequest", url=f"/device/{device_id}"
-                )
-                response.set_result(
-                    response_from_json_file(
-                        f"{response_path}device/{device_id}/device.json"
-                    )
+                await self._run_script(
+                    leap,
+                    wait,
+                    [
+                        (
+                            Request(
+                                communique_type="ReadRequest",
+                                url=f"/device/{device_id}/buttongroup/expanded",
+                            ),
+                            button_group_result,
+                        ),
+                        (
+                            Request(
+                                communique_type="ReadRequest",
+                                url=f"/device/{device_id}",
+                            ),
+                            response_from_json_file(
+                                f"{response_path}device/{device_id}/device.json"
+                            ),
+                        ),
+                    ],
                 )
-                leap.requests.task_done()
-
-                for group in button_group_result.Body["ButtonGroupsExpanded"]:
-                    for button in group["Buttons"]:
-                        if button.get("AssociatedLED", None) is not None:
-                            led_id = id_from_href(button["AssociatedLED"]["href"])
-                            request, response = await wait(leap.requests.get())
-                            assert request == Request(
-                                communique_type="SubscribeRequest",
-                                url=f"/led/{led_id}/status",
-                            )
-                            response.set_result(self.button_subscription_data_result)
-                            leap.requests.task_done()
-
-                self._populate_button_list_from_buttongroups(
-                    button_group_result.Body["ButtonGroupsExpanded"], bridge_type
-                )
-                self._populate_button_led_list_from_buttongroups(
+
+                led_ids = self._populate_from_buttongroups(
                     button_group_result.Body["ButtonGroupsExpanded"], bridge_type
                 )
+                for led_id in led_ids:
+                    await self._expect(
+                        leap,
+                        wait,
+                        Request(
+                            communique_type="SubscribeRequest",
+                            url=f"/led/{led_id}/status",
+                        ),
+                        self.button_subscription_data_result,
+                    )
 
-    def _populate_button_list_from_buttongroups(self, buttongroups, bridge_type):
-        """Add buttons from a set of buttongroups to the proper processor list
-        to support subscribe tests
+    def _populate_from_buttongroups(self, buttongroups, bridge_type):
+        """Add buttons and button LEDs from a set of buttongroups to the proper
+        processor lists to support subscribe tests
 
         Args:
             buttongroups: A set of buttongroups
             bridge_type: The bridge or processor type
+
+        Returns:
+            The ids of the button LEDs, in buttongroup order
         """
-        buttons = []
-        buttons.extend(
-            [
-                id_from_href(button["href"])
-                for group in buttongroups
-                for button in group["Buttons"]
-            ]
-        )
         if bridge_type == RA3_PROCESSOR:
-            self.ra3_button_list.extend(buttons)
+            buttons = self.ra3_button_list
+            button_leds = self.ra3_button_led_list
         elif bridge_type == HWQSX_PROCESSOR:
-            self.qsx_button_list.extend(buttons)
-
-    def _populate_button_led_list_from_buttongroups(self, buttongroups, bridge_type):
-        """Add button LEDs from a set of buttongroups to the proper processor list
-        to support subscribe tests
+            buttons = self.qsx_button_list
+            button_leds = self.qsx_button_led_list
+        else:
+            buttons = []
+            button_leds = []
 
-        Args:
-            buttongroups: A set of buttongroups
-            bridge_type: The bridge or processor type
-        """
-        button_leds = []
+        led_ids = []
         for group in buttongroups:
             for button in group["Buttons"]:
-                if button.get("AssociatedLED", None) is not None:
-                    button_leds.append(id_from_href(button["AssociatedLED"]["href"]))
-        if bridge_type == RA3_PROCESSOR:
-            self.ra3_button_led_list.extend(button_leds)
-        elif bridge_type == HWQSX_PROCESSOR:
-            self.qsx_button_led_list.extend(button_leds)
+                buttons.append(id_from_href(button["href"]))
+                led = button.get("AssociatedLED")
+                if led is not None:
+                    led_ids.append(id_from_href(led["href"]))
+        button_leds.extend(led_ids)
+        return led_ids
 
     async def _accept_connection_ra3(self, leap, wait):
-        """Accept a connection from SmartBridge (implementation)."""
-        ra3_response_path = RESPONSE_PATH[RA3_PROCESSOR]
-
-        # Read request on /areas
-        ra3_area_list_result = response_from_json_file(f"{ra3_response_path}areas.json")
-        request, response = await wait(leap.requests.get())
-        assert request == Request(communique_type="ReadRequest", url="/area")
-        response.set_result(ra3_area_list_result)
-        leap.requests.task_done()
-
-        # Read request on /project
-        request, response = await wait(leap.requests.get())
-        assert request == Request(communique_type="ReadRequest", url="/project")
-        response.set_result(response_from_json_file(f"{ra3_response_path}project.json"))
-        leap.requests.task_done()
-
-        # Read request on /device?where=IsThisDevice:true
-        request, response = await wait(leap.requests.get())
-        assert request == Request(
-            communique_type="ReadRequest", url="/device?where=IsThisDevice:true"
-        )
-        response.set_result(
-            response_from_json_file(f"{ra3_response_path}/processor.json")
-        )
-        leap.requests.task_done()
-
-        # Read request on each area's control stations & zones
-        for area_id in (
-            re.sub(r".*/", "", area["href"])
-            for area in ra3_area_list_result.Body.get("Areas", [])
-        ):
-            request, response = await wait(leap.requests.get())
-            assert request == Request(
-                communique_type="ReadRequest",
-                url=f"/area/{area_id}/associatedcontrolstation",
-            )
-            station_result = response_from_json_file(
-                f"{ra3_response_path}area/{area_id}/controlstation.json"
-            )
-            response.set_result(station_result)
-            leap.requests.task_done()
-            await self._process_station(station_result, leap, wait, RA3_PROCESSOR)
-
-            request, response = await wait(leap.requests.get())
-            assert request == Request(
-                communique_type="ReadRequest", url=f"/area/{area_id}/associatedzone"
-            )
-            zone_result = response_from_json_file(
-                f"{ra3_response_path}area/{area_id}/associatedzone.json"
-            )
-            response.set_result(zone_result)
-            leap.requests.task_done()
-
-        # Read request on /zone/status
-        request, response = await wait(leap.requests.get())
-        assert request == Request(
-            communique_type="SubscribeRequest", url="/zone/status"
-        )
-        response.set_result(
-            response_from_json_file(f"{ra3_response_path}zonestatus.json")
-        )
-        leap.requests.task_done()
-
-        # Subscribe request on /button/{button}/status/event
-        for button in self.ra3_button_list:
-            request, response = await wait(leap.requests.get())
-            assert request == Request(
-                communique_type="SubscribeRequest", url=f"/button/{button}/status/event"
-            )
-            response.set_result(self.button_subscription_data_result)
-            leap.requests.task_done()
-
-        # Read request on /device?where=IsThisDevice:false
-        request, response = await wait(leap.requests.get())
-        assert request == Request(
-            communique_type="ReadRequest", url="/device?where=IsThisDevice:false"
-        )
-        response.set_result(
-            response_from_json_file(f"{ra3_response_path}device-list.json")
-        )
-        leap.requests.task_done()
-
-        # Subscribe request on /area/status
-        request, response = await wait(leap.requests.get())
-        assert request == Request(
-            communique_type="SubscribeRequest", url="/area/status"
-        )
-        response.set_result(
-            response_from_json_file(f"{ra3_response_path}area/status-subscribe.json")
-        )
-        leap.requests.task_done()
+        """Accept a connection as a mock RA3 processor (implementation)."""
+        await self._accept_processor_connection(leap, wait, RA3_PROCESSOR)
 
     async def _accept_connection_qsx(self, leap, wait):
         """Accept a connection as a mock QSX processor (implementation)."""
-        hwqsx_response_path = RESPONSE_PATH[HWQSX_PROCESSOR]
+        await self._accept_processor_connection(leap, wait, HWQSX_PROCESSOR)
 
-        # Read request on /areas
-        qsx_area_list_result = response_from_json_file(
-            f"{hwqsx_response_path}areas.json"
-        )
-        request, response = await wait(leap.requests.get())
-        assert request == Request(communique_type="ReadRequest", url="/area")
-        response.set_result(qsx_area_list_result)
-        leap.requests.task_done()
-
-        # Read request on /project
-        request, response = await wait(leap.requests.get())
-        assert request == Request(communique_type="ReadRequest", url="/project")
-        response.set_result(
-            response_from_json_file(f"{hwqsx_response_path}project.json")
-        )
-        leap.requests.task_done()
+    async def _accept_processor_connection(self, leap, wait, bridge_type):
+        """Accept a connection as a mock RA3 or QSX processor (implementation)."""
+        response_path = RESPONSE_PATH[bridge_type]
 
-        # Read request on /device?where=IsThisDevice:true
-        request, response = await wait(leap.requests.get())
-        assert request == Request(
-            communique_type="ReadRequest", url="/device?where=IsThisDevice:true"
-        )
-        response.set_result(
-            response_from_json_file(f"{hwqsx_response_path}processor.json")
+        area_list_result = response_from_json_file(f"{response_path}areas.json")
+        await self._run_script(
+            leap,
+            wait,
+            [
+                (Request(communique_type="ReadRequest", url="/area"), area_list_result),
+                (
+                    Request(communique_type="ReadRequest", url="/project"),
+                    response_from_json_file(f"{response_path}project.json"),
+                ),
+                (
+                    Request(
+                        communique_type="ReadRequest",
+                        url="/device?where=IsThisDevice:true",
+                    ),
+                    response_from_json_file(f"{response_path}processor.json"),
+                ),
+            ],
         )
-        leap.requests.task_done()
 
         # Read request on each area's control stations & zones
-        for area_id in (
-            re.sub(r".*/", "", area["href"])
-            for area in qsx_area_list_result.Body.get("Areas", [])
-        ):
-            request, response = await wait(leap.requests.get())
-            assert request == Request(
-                communique_type="ReadRequest",
-                url=f"/area/{area_id}/associatedcontrolstation",
-            )
+        for area in area_list_result.Body.get("Areas", []):
+            area_id = id_from_href(area["href"])
             station_result = response_from_json_file(
-                f"{hwqsx_response_path}area/{area_id}/controlstation.json"
+                f"{response_path}area/{area_id}/controlstation.json"
             )
-            response.set_result(station_result)
-            leap.requests.task_done()
-            await self._process_station(
-                station_result, leap, wait, bridge_type=HWQSX_PROCESSOR
-            )
-
-            request, response = await wait(leap.requests.get())
-            assert request == Request(
-                communique_type="ReadRequest", url=f"/area/{area_id}/associatedzone"
+            await self._expect(
+                leap,
+                wait,
+                Request(
+                    communique_type="ReadRequest",
+                    url=f"/area/{area_id}/associatedcontrolstation",
+                ),
+                station_result,
             )
-            zone_result = response_from_json_file(
-                f"{hwqsx_response_path}area/{area_id}/associatedzone.json"
+            await self._process_station(station_result, leap, wait, bridge_type)
+
+            await self._expect(
+                leap,
+                wait,
+                Request(
+                    communique_type="ReadRequest", url=f"/area/{area_id}/associatedzone"
+                ),
+                response_from_json_file(
+                    f"{response_path}area/{area_id}/associatedzone.json"
+                ),
             )
-            response.set_result(zone_result)
-            leap.requests.task_done()
 
         # Read request on /zone/status
-        request, response = await wait(leap.requests.get())
-        assert request == Request(
-            communique_type="SubscribeRequest", url="/zone/status"
-        )
-        response.set_result(
-            response_from_json_file(f"{hwqsx_response_path}zonestatus.json")
+        await self._expect(
+            leap,
+            wait,
+            Request(communique_type="SubscribeRequest", url="/zone/status"),
+            response_from_json_file(f"{response_path}zonestatus.json"),
         )
-        leap.requests.task_done()
 
         # Subscribe request on /button/{button}/status/event
-        for button in self.qsx_button_list:
-            request, response = await wait(leap.requests.get())
-            assert request == Request(
-                communique_type="SubscribeRequest", url=f"/button/{button}/status/event"
+        if bridge_type == RA3_PROCESSOR:
+            button_list = self.ra3_button_list
+        else:
+            button_list = self.qsx_button_list
+        for button in button_list:
+            await self._expect(
+                leap,
+                wait,
+                Request(
+                    communique_type="SubscribeRequest",
+                    url=f"/button/{button}/status/event",
+                ),
+                self.button_subscription_data_result,
             )
-            response.set_result(self.button_subscription_data_result)
-            leap.requests.task_done()
-
-        # Read request on /device?where=IsThisDevice:false
-        request, response = await wait(leap.requests.get())
-        assert request == Request(
-            communique_type="ReadRequest", url="/device?where=IsThisDevice:false"
-        )
-        response.set_result(
-            response_from_json_file(f"{hwqsx_response_path}device-list.json")
-        )
-        leap.requests.task_done()
 
-        # Subscribe request on /area/status
-        request, response = await wait(leap.requests.get())
-        assert request == Request(
-            communique_type="SubscribeRequest", url="/area/status"
-        )
-        response.set_result(
-            response_from_json_file(f"{hwqsx_response_path}area/status-subscribe.json")
+        await self._run_script(
+            leap,
+            wait,
+            [
+                (
+                    Request(
+                        communique_type="ReadRequest",
+                        url="/device?where=IsThisDevice:false",
+                    ),
+                    response_from_json_file(f"{response_path}device-list.json"),
+                ),
+                (
+                    Request(communique_type="SubscribeRequest", url="/area/status"),
+                    response_from_json_file(
+                        f"{response_path}area/status-subscribe.json"
+                    ),
+                ),
+            ],
         )
-        leap.requests.task_done()
 
     def disconnect(self, exception=None):
         """Disconnect SmartBridge."""
@@ -669,18 +691,9 @@ async def test_notifications(bridge: Bridge):
         notified = True
 
     bridge.target.add_subscriber("2", callback)
-    bridge.leap.send_unsolicited(
-        Response(
-            CommuniqueType="ReadResponse",
-            Header=ResponseHeader(
-                MessageBodyType="OneZoneStatus",
-                StatusCode=ResponseStatus(200, "OK"),
-                Url="/zone/1/status",
-            ),
-            Body={"ZoneStatus": {"Level": 100, "Zone": {"href": "/zone/1"}}},
-        )
-    )
-    await asyncio.wait_for(bridge.leap.requests.join(), 10)
+    bridge.leap.send_unsolicited(_zone_status_response("1", {"Level": 100}))
+    async with asyncio_timeout(10):
+        await bridge.leap.requests.join()
     assert notified
 
 
@@ -858,51 +871,11 @@ async def test_device_list(bridge: Bridge):
 
     assert devices == expected_devices
 
-    bridge.leap.send_unsolicited(
-        Response(
-            CommuniqueType="ReadResponse",
-            Header=ResponseHeader(
-                MessageBodyType="OneZoneStatus",
-                StatusCode=ResponseStatus(200, "OK"),
-                Url="/zone/1/status",
-            ),
-            Body={"ZoneStatus": {"Level": 100, "Zone": {"href": "/zone/1"}}},
-        )
-    )
-    bridge.leap.send_unsolicited(
-        Response(
-            CommuniqueType="ReadResponse",
-            Header=ResponseHeader(
-                MessageBodyType="OneZoneStatus",
-                StatusCode=ResponseStatus(200, "OK"),
-                Url="/zone/2/status",
-            ),
-            Body={"ZoneStatus": {"FanSpeed": "Medium", "Zone": {"href": "/zone/2"}}},
-        )
-    )
-    bridge.leap.send_unsolicited(
-        Response(
-            CommuniqueType="ReadResponse",
-            Header=ResponseHeader(
-                MessageBodyType="OneZoneStatus",
-                StatusCode=ResponseStatus(200, "OK"),
-                Url="/zone/3/status",
-            ),
-            Body={"ZoneStatus": {"Tilt": 25, "Zone": {"href": "/zone/3"}}},
-        )
-    )
+    bridge.leap.send_unsolicited(_zone_status_response("1", {"Level": 100}))
+    bridge.leap.send_unsolicited(_zone_status_response("2", {"FanSpeed": "Medium"}))
+    bridge.leap.send_unsolicited(_zone_status_response("3", {"Tilt": 25}))
 
-    bridge.leap.send_unsolicited(
-        Response(
-            CommuniqueType="ReadResponse",
-            Header=ResponseHeader(
-                MessageBodyType="OneZoneStatus",
-                StatusCode=ResponseStatus(200, "OK"),
-                Url="/zone/4/status",
-            ),
-            Body={"ZoneStatus": {"Tilt": 40, "Zone": {"href": "/zone/4"}}},
-        )
-    )
+    bridge.leap.send_unsolicited(_zone_status_response("4", {"Tilt": 40}))
 
     devices = bridge.target.get_devices()
     assert devices["2"]["current_state"] == 100
@@ -945,6 +918,26 @@ async def test_device_list(bridge: Bridge):
     devices = bridge.target.get_devices_by_type("Tilt")
     assert [device["device_id"] for device in devices] == ["11"]
 
+    # callers get their own list
+    devices.clear()
+    devices = bridge.target.get_devices_by_type("Tilt")
+    assert [device["device_id"] for device in devices] == ["11"]
+
+    assert bridge.target.get_devices_by_domain("unknown") == []
+
+    # lookups follow the devices, even when one is swapped for another
+    tilt = bridge.target.devices.pop("11")
+    bridge.target.devices["12"] = {
+        **tilt,
+        "device_id": "12",
+        "type": "SerenaTiltOnlyWoodBlind",
+    }
+    assert bridge.target.get_devices_by_type("Tilt") == []
+    devices = bridge.target.get_devices_by_type("SerenaTiltOnlyWoodBlind")
+    assert [device["device_id"] for device in devices] == ["10", "12"]
+    devices = bridge.target.get_devices_by_domain("cover")
+    assert [device["device_id"] for device in devices] == ["7", "10", "12"]
+
 
 @pytest.mark.asyncio
 async def test_lip_device_list(bridge: Bridge):
@@ -1055,6 +1048,30 @@ async def test_initialization_without_buttons(bridge_uninit: Bridge):
     assert bridge.target.buttons == {}
 
 
+@pytest.mark.asyncio
+async def test_initialization_login_failure(bridge_uninit: Bridge):
+    """Test that a login failure during the handshake is reported cleanly."""
+    bridge = bridge_uninit
+    bridge.button_list_result = Response(
+        Header=ResponseHeader(
+            StatusCode=ResponseStatus(code=500, message="Internal Server Error"),
+            Url="/button",
+        ),
+        CommuniqueType="ReadResponse",
+        Body={},
+    )
+
+    with pytest.raises(BridgeResponseError):
+        await bridge.initialize()
+
+    # the failure must not leave a pending cancellation on the test task
+    task = asyncio.current_task()
+    assert task is not None
+    if sys.version_info >= (3, 11):
+        assert task.cancelling() == 0
+    await asyncio.sleep(0)
+
+
 @pytest.mark.asyncio
 async def test_occupancy_no_bodies(bridge_uninit: Bridge):
     """Test the that the bridge initializes even if no occupancy status is returned."""
@@ -1199,164 +1216,96 @@ async def test_button_status_change_notification(bridge: Bridge):
     assert notified
 
 
+@pytest.mark.asyncio
+async def test_button_status_burst(bridge: Bridge):
+    """Test that back-to-back button events are delivered in order."""
+    statuses: List[str] = []
+    bridge.target.add_button_subscriber("101", statuses.append)
+
+    event_types = ["Press", "Release", "Press"]
+    for event_type in event_types:
+        bridge.leap.send_to_subscribers(
+            Response(
+                CommuniqueType="ReadResponse",
+                Header=ResponseHeader(
+                    MessageBodyType="OneButtonStatusEvent",
+                    StatusCode=_OK_STATUS,
+                    Url="/button/101/status/event",
+                ),
+                Body={
+                    "ButtonStatus": {
+                        "Button": {"href": "/button/101"},
+                        "ButtonEvent": {"EventType": event_type},
+                    }
+                },
+            )
+        )
+
+    assert statuses == [
+        BUTTON_STATUS_PRESSED,
+        BUTTON_STATUS_RELEASED,
+        BUTTON_STATUS_PRESSED,
+    ]
+    assert bridge.target.buttons["101"]["current_state"] == BUTTON_STATUS_PRESSED
+
+
 @pytest.mark.asyncio
 async def test_is_on(bridge: Bridge):
     """Test the is_on method returns device state."""
-    bridge.leap.send_unsolicited(
-        Response(
-            CommuniqueType="ReadResponse",
-            Header=ResponseHeader(
-                MessageBodyType="OneZoneStatus",
-                StatusCode=ResponseStatus(200, "OK"),
-                Url="/zone/1/status",
-            ),
-            Body={"ZoneStatus": {"Level": 50, "Zone": {"href": "/zone/1"}}},
-        )
-    )
+    bridge.leap.send_unsolicited(_zone_status_response("1", {"Level": 50}))
     assert bridge.target.is_on("2") is True
 
-    bridge.leap.send_unsolicited(
-        Response(
-            CommuniqueType="ReadResponse",
-            Header=ResponseHeader(
-                MessageBodyType="OneZoneStatus",
-                StatusCode=ResponseStatus(200, "OK"),
-                Url="/zone/1/status",
-            ),
-            Body={"ZoneStatus": {"Level": 0, "Zone": {"href": "/zone/1"}}},
-        )
-    )
+    bridge.leap.send_unsolicited(_zone_status_response("1", {"Level": 0}))
     assert bridge.target.is_on("2") is False
 
 
 @pytest.mark.asyncio
 async def test_is_on_fan(bridge: Bridge):
     """Test the is_on method returns device state for fans."""
-    bridge.leap.send_unsolicited(
-        Response(
-            CommuniqueType="ReadResponse",
-            Header=ResponseHeader(
-                MessageBodyType="OneZoneStatus",
-                StatusCode=ResponseStatus(200, "OK"),
-                Url="/zone/1/status",
-            ),
-            Body={"ZoneStatus": {"FanSpeed": "Medium", "Zone": {"href": "/zone/1"}}},
-        )
-    )
+    bridge.leap.send_unsolicited(_zone_status_response("1", {"FanSpeed": "Medium"}))
     assert bridge.target.is_on("2") is True
 
-    bridge.leap.send_unsolicited(
-        Response(
-            CommuniqueType="ReadResponse",
-            Header=ResponseHeader(
-                MessageBodyType="OneZoneStatus",
-                StatusCode=ResponseStatus(200, "OK"),
-                Url="/zone/1/status",
-            ),
-            Body={"ZoneStatus": {"FanSpeed": "Off", "Zone": {"href": "/zone/1"}}},
-        )
-    )
+    bridge.leap.send_unsolicited(_zone_status_response("1", {"FanSpeed": "Off"}))
     assert bridge.target.is_on("2") is False
 
 
-@pytest.mark.asyncio
-async def test_set_value(bridge: Bridge):
-    """Test that setting values produces the right commands."""
-    task = asyncio.get_running_loop().create_task(bridge.target.set_value("2", 50))
-    command, response = await bridge.leap.requests.get()
-    assert command == Request(
-        communique_type="CreateRequest",
-        url="/zone/1/commandprocessor",
-        body={
-            "Command": {
-                "CommandType": "GoToLevel",
-                "Parameter": [{"Type": "Level", "Value": 50}],
-            }
-        },
-    )
-    response.set_result(
-        Response(
-            CommuniqueType="CreateResponse",
-            Header=ResponseHeader(
-                MessageBodyType="OneZoneStatus",
-                StatusCode=ResponseStatus(201, "Created"),
-                Url="/zone/1/commandprocessor",
-            ),
-            Body={
-                "ZoneStatus": {
-                    "href": "/zone/1/status",
-                    "Level": 50,
-                    "Zone": {"href": "/zone/1"},
+async def _check_level_commands(bridge: Bridge, device_id: str, zone_id: str):
+    """Check the commands sent by set_value, turn_on and turn_off for a device."""
+    loop = asyncio.get_running_loop()
+    levels = (50, 100, 0)
+    tasks = [
+        loop.create_task(bridge.target.set_value(device_id, 50)),
+        loop.create_task(bridge.target.turn_on(device_id)),
+        loop.create_task(bridge.target.turn_off(device_id)),
+    ]
+
+    commands = []
+    for level in levels:
+        command, response = await bridge.leap.requests.get()
+        commands.append(command)
+        response.set_result(_zone_command_response(zone_id, level))
+        bridge.leap.requests.task_done()
+    await asyncio.gather(*tasks)
+
+    assert commands == [
+        Request(
+            communique_type="CreateRequest",
+            url=f"/zone/{zone_id}/commandprocessor",
+            body={
+                "Command": {
+                    "CommandType": "GoToLevel",
+                    "Parameter": [{"Type": "Level", "Value": level}],
                 }
             },
         )
-    )
-    bridge.leap.requests.task_done()
-    await task
+        for level in levels
+    ]
 
-    task = asyncio.get_running_loop().create_task(bridge.target.turn_on("2"))
-    command, response = await bridge.leap.requests.get()
-    assert command == Request(
-        communique_type="CreateRequest",
-        url="/zone/1/commandprocessor",
-        body={
-            "Command": {
-                "CommandType": "GoToLevel",
-                "Parameter": [{"Type": "Level", "Value": 100}],
-            }
-        },
-    )
-    response.set_result(
-        Response(
-            CommuniqueType="CreateResponse",
-            Header=ResponseHeader(
-                MessageBodyType="OneZoneStatus",
-                StatusCode=ResponseStatus(201, "Created"),
-                Url="/zone/1/commandprocessor",
-            ),
-            Body={
-                "ZoneStatus": {
-                    "href": "/zone/1/status",
-                    "Level": 100,
-                    "Zone": {"href": "/zone/1"},
-                }
-            },
-        ),
-    )
-    bridge.leap.requests.task_done()
-    await task
 
-    task = asyncio.get_running_loop().create_task(bridge.target.turn_off("2"))
-    command, response = await bridge.leap.requests.get()
-    assert command == Request(
-        communique_type="CreateRequest",
-        url="/zone/1/commandprocessor",
-        body={
-            "Command": {
-                "CommandType": "GoToLevel",
-                "Parameter": [{"Type": "Level", "Value": 0}],
-            }
-        },
-    )
-    response.set_result(
-        Response(
-            CommuniqueType="CreateResponse",
-            Header=ResponseHeader(
-                MessageBodyType="OneZoneStatus",
-                StatusCode=ResponseStatus(201, "Created"),
-                Url="/zone/1/commandprocessor",
-            ),
-            Body={
-                "ZoneStatus": {
-                    "href": "/zone/1/status",
-                    "Level": 0,
-                    "Zone": {"href": "/zone/1"},
-                }
-            },
-        ),
-    )
-    bridge.leap.requests.task_done()
-    await task
+@pytest.mark.asyncio
+async def test_set_value(bridge: Bridge):
+    """Test that setting values produces the right commands."""
+    await _check_level_commands(bridge, "2", "1")
 
 
 @pytest.mark.asyncio
@@ -1501,15 +1450,17 @@ async def test_activate_scene(bridge: Bridge):
 
 
 @pytest.mark.asyncio
-async def test_reconnect_eof(bridge: Bridge):
-    """Test that SmartBridge can reconnect on disconnect."""
-    time = 0.0
-    asyncio.get_running_loop().time = lambda: time  # type: ignore [method-assign]
+@pytest.mark.parametrize(
+    "exception", [None, ConnectionResetError()], ids=["eof", "connection_reset"]
+)
+async def test_reconnect(bridge: Bridge, exception: Optional[Exception]):
+    """Test that SmartBridge can reconnect on disconnect or error."""
+    clock = _FakeClock()
 
-    bridge.disconnect()
+    bridge.disconnect(exception)
 
     await asyncio.sleep(0.0)
-    time += smartbridge.RECONNECT_DELAY
+    clock.advance(smartbridge.RECONNECT_DELAY)
 
     await bridge.accept_connection()
 
@@ -1523,8 +1474,7 @@ async def test_reconnect_eof(bridge: Bridge):
 @pytest.mark.asyncio
 async def test_connect_error():
     """Test that SmartBridge can retry failed connections."""
-    time = 0.0
-    asyncio.get_running_loop().time = lambda: time
+    clock = _FakeClock()
 
     tried = asyncio.Event()
 
@@ -1538,50 +1488,29 @@ async def test_connect_error():
 
     await tried.wait()
     tried.clear()
-    time += smartbridge.RECONNECT_DELAY
+    clock.advance(smartbridge.RECONNECT_DELAY)
 
     await tried.wait()
     connect_task.cancel()
 
 
-@pytest.mark.asyncio
-async def test_reconnect_error(bridge: Bridge):
-    """Test that SmartBridge can reconnect on error."""
-    time = 0.0
-    asyncio.get_running_loop().time = lambda: time  # type: ignore [method-assign]
-
-    bridge.disconnect()
-
-    await asyncio.sleep(0.0)
-    time += smartbridge.RECONNECT_DELAY
-
-    await bridge.accept_connection()
-
-    task = asyncio.get_running_loop().create_task(bridge.target.set_value("2", 50))
-    command, _ = await bridge.leap.requests.get()
-    assert command is not None
-    bridge.leap.requests.task_done()
-    task.cancel()
-
-
 @pytest.mark.asyncio
 async def test_reconnect_timeout():
     """Test that SmartBridge can reconnect if the remote does not respond."""
     bridge = Bridge()
 
-    time = 0.0
-    asyncio.get_running_loop().time = lambda: time
+    clock = _FakeClock()
 
     await bridge.initialize()
 
-    time = smartbridge.PING_INTERVAL
+    clock.advance(smartbridge.PING_INTERVAL)
     ping, _ = await bridge.leap.requests.get()
     assert ping == Request(communique_type="ReadRequest", url="/server/1/status/ping")
     bridge.leap.requests.task_done()
 
-    time += smartbridge.REQUEST_TIMEOUT
+    clock.advance(smartbridge.REQUEST_TIMEOUT)
     await bridge.leap.running
-    time += smartbridge.RECONNECT_DELAY
+    clock.advance(smartbridge.RECONNECT_DELAY)
     await bridge.accept_connection()
 
     task = asyncio.get_running_loop().create_task(bridge.target.set_value("2", 50))
@@ -1616,326 +1545,308 @@ async def test_ra3_notifications(ra3_bridge: Bridge):
         notified = True
 
     ra3_bridge.target.add_subscriber("1377", callback)
-    ra3_bridge.leap.send_unsolicited(
-        Response(
-            CommuniqueType="ReadResponse",
-            Header=ResponseHeader(
-                MessageBodyType="OneZoneStatus",
-                StatusCode=ResponseStatus(200, "OK"),
-                Url="/zone/1337/status",
-            ),
-            Body={"ZoneStatus": {"Level": 100, "Zone": {"href": "/zone/1377"}}},
-        )
-    )
-    await asyncio.wait_for(ra3_bridge.leap.requests.join(), 10)
+    ra3_bridge.leap.send_unsolicited(_zone_status_response("1377", {"Level": 100}))
+    async with asyncio_timeout(10):
+        await ra3_bridge.leap.requests.join()
     assert notified
     await ra3_bridge.target.close()
 
 
+_EXPECTED_RA3_DEVICES = {
+    "1": {
+        "area": "83",
+        "button_groups": None,
+        "current_state": -1,
+        "device_id": "1",
+        "device_name": "Enclosure Device 001",
+        "fan_speed": None,
+        "model": "JanusProcRA3",
+        "name": "Equipment Room Enclosure Device 001",
+        "serial": 11111111,
+        "type": "RadioRa3Processor",
+        "zone": "1",
+    },
+    "1361": {
+        "area": "547",
+        "button_groups": None,
+        "current_state": 0,
+        "device_id": "1361",
+        "device_name": "Vanities",
+        "fan_speed": None,
+        "model": None,
+        "name": "Primary Bath_Vanities",
+        "serial": None,
+        "tilt": None,
+        "type": "Dimmed",
+        "zone": "1361",
+        "white_tuning_range": None,
+    },
+    "1377": {
+        "area": "547",
+        "button_groups": None,
+        "current_state": 0,
+        "device_id": "1377",
+        "device_name": "Shower & Tub",
+        "fan_speed": None,
+        "model": None,
+        "name": "Primary Bath_Shower & Tub",
+        "serial": None,
+        "tilt": None,
+        "type": "Dimmed",
+        "zone": "1377",
+        "white_tuning_range": None,
+    },
+    "1393": {
+        "area": "547",
+        "button_groups": None,
+        "current_state": 0,
+        "device_id": "1393",
+        "device_name": "Vent",
+        "fan_speed": None,
+        "model": None,
+        "name": "Primary Bath_Vent",
+        "serial": None,
+        "tilt": None,
+        "type": "Switched",
+        "zone": "1393",
+        "white_tuning_range": None,
+    },
+    "1488": {
+        "area": "547",
+        "button_groups": ["1491"],
+        "control_station_name": "Entry",
+        "current_state": -1,
+        "device_id": "1488",
+        "device_name": "Audio Pico",
+        "fan_speed": None,
+        "model": "PJ2-3BRL-XXX-A02",
+        "name": "Primary Bath_Entry Audio Pico Pico",
+        "serial": None,
+        "type": "Pico3ButtonRaiseLower",
+        "zone": None,
+    },
+    "2010": {
+        "area": "2796",
+        "button_groups": None,
+        "current_state": 0,
+        "device_id": "2010",
+        "device_name": "Porch",
+        "fan_speed": None,
+        "model": None,
+        "name": "Porch_Porch",
+        "serial": None,
+        "tilt": None,
+        "type": "Dimmed",
+        "zone": "2010",
+        "white_tuning_range": None,
+    },
+    "2091": {
+        "area": "766",
+        "button_groups": None,
+        "current_state": 0,
+        "device_id": "2091",
+        "device_name": "Overhead",
+        "fan_speed": None,
+        "model": None,
+        "name": "Entry_Overhead",
+        "serial": None,
+        "tilt": None,
+        "type": "Dimmed",
+        "zone": "2091",
+        "white_tuning_range": None,
+    },
+    "2107": {
+        "area": "766",
+        "button_groups": None,
+        "current_state": 0,
+        "device_id": "2107",
+        "device_name": "Landscape",
+        "fan_speed": None,
+        "model": None,
+        "name": "Entry_Landscape",
+        "serial": None,
+        "tilt": None,
+        "type": "Dimmed",
+        "zone": "2107",
+        "white_tuning_range": None,
+    },
+    "2139": {
+        "area": "766",
+        "button_groups": ["2148"],
+        "control_station_name": "Entry by Living Room",
+        "current_state": -1,
+        "device_id": "2139",
+        "device_name": "Scene Keypad",
+        "fan_speed": None,
+        "model": "RRST-W4B-XX",
+        "name": "Entry_Entry by Living Room Scene Keypad Keypad",
+        "serial": None,
+        "type": "SunnataKeypad",
+        "zone": None,
+    },
+    "2144": {
+        "current_state": -1,
+        "device_id": "2144",
+        "device_name": "Bright LED",
+        "fan_speed": None,
+        "model": "KeypadLED",
+        "name": "Entry_Entry by Living Room Scene Keypad Keypad Bright LED",
+        "parent_device": "2139",
+        "serial": None,
+        "type": "KeypadLED",
+        "zone": None,
+    },
+    "2145": {
+        "current_state": -1,
+        "device_id": "2145",
+        "device_name": "Entertain LED",
+        "fan_speed": None,
+        "model": "KeypadLED",
+        "name": "Entry_Entry by Living Room Scene Keypad Keypad Entertain LED",
+        "parent_device": "2139",
+        "serial": None,
+        "type": "KeypadLED",
+        "zone": None,
+    },
+    "2146": {
+        "current_state": -1,
+        "device_id": "2146",
+        "device_name": "Dining LED",
+        "fan_speed": None,
+        "model": "KeypadLED",
+        "name": "Entry_Entry by Living Room Scene Keypad Keypad Dining LED",
+        "parent_device": "2139",
+        "serial": None,
+        "type": "KeypadLED",
+        "zone": None,
+    },
+    "2147": {
+        "current_state": -1,
+        "device_id": "2147",
+        "device_name": "Off LED",
+        "fan_speed": None,
+        "model": "KeypadLED",
+        "name": "Entry_Entry by Living Room Scene Keypad Keypad Off LED",
+        "parent_device": "2139",
+        "serial": None,
+        "type": "KeypadLED",
+        "zone": None,
+    },
+    "2171": {
+        "area": "766",
+        "button_groups": ["2180"],
+        "control_station_name": "Entry by Living Room",
+        "current_state": -1,
+        "device_id": "2171",
+        "device_name": "Fan Keypad",
+        "fan_speed": None,
+        "model": "RRST-W4B-XX",
+        "name": "Entry_Entry by Living Room Fan Keypad Keypad",
+        "serial": None,
+        "type": "SunnataKeypad",
+        "zone": None,
+    },
+    "2176": {
+        "current_state": -1,
+        "device_id": "2176",
+        "device_name": "Fan High LED",
+        "fan_speed": None,
+        "model": "KeypadLED",
+        "name": "Entry_Entry by Living Room Fan Keypad Keypad Fan High LED",
+        "parent_device": "2171",
+        "serial": None,
+        "type": "KeypadLED",
+        "zone": None,
+    },
+    "2177": {
+        "current_state": -1,
+        "device_id": "2177",
+        "device_name": "Medium LED",
+        "fan_speed": None,
+        "model": "KeypadLED",
+        "name": "Entry_Entry by Living Room Fan Keypad Keypad Medium LED",
+        "parent_device": "2171",
+        "serial": None,
+        "type": "KeypadLED",
+        "zone": None,
+    },
+    "2178": {
+        "current_state": -1,
+        "device_id": "2178",
+        "device_name": "Low LED",
+        "fan_speed": None,
+        "model": "KeypadLED",
+        "name": "Entry_Entry by Living Room Fan Keypad Keypad Low LED",
+        "parent_device": "2171",
+        "serial": None,
+        "type": "KeypadLED",
+        "zone": None,
+    },
+    "2179": {
+        "current_state": -1,
+        "device_id": "2179",
+        "device_name": "Off LED",
+        "fan_speed": None,
+        "model": "KeypadLED",
+        "name": "Entry_Entry by Living Room Fan Keypad Keypad Off LED",
+        "parent_device": "2171",
+        "serial": None,
+        "type": "KeypadLED",
+        "zone": None,
+    },
+    "2939": {
+        "area": "547",
+        "button_groups": ["2942"],
+        "control_station_name": "Vanity",
+        "current_state": -1,
+        "device_id": "2939",
+        "device_name": "Audio Pico",
+        "fan_speed": None,
+        "model": "PJ2-3BRL-XXX-A02",
+        "name": "Primary Bath_Vanity Audio Pico Pico",
+        "serial": None,
+        "type": "Pico3ButtonRaiseLower",
+        "zone": None,
+    },
+    "5341": {
+        "area": "83",
+        "button_groups": ["5344"],
+        "control_station_name": "TestingPico",
+        "current_state": -1,
+        "device_id": "5341",
+        "device_name": "TestingPicoDev",
+        "fan_speed": None,
+        "model": "PJ2-3BRL-XXX-L01",
+        "name": "Equipment Room_TestingPico TestingPicoDev Pico",
+        "serial": 68130838,
+        "type": "Pico3ButtonRaiseLower",
+        "zone": None,
+    },
+    "536": {
+        "area": "83",
+        "button_groups": None,
+        "current_state": 0,
+        "device_id": "536",
+        "device_name": "Overhead",
+        "fan_speed": None,
+        "model": None,
+        "name": "Equipment Room_Overhead",
+        "serial": None,
+        "tilt": None,
+        "type": "Switched",
+        "zone": "536",
+        "white_tuning_range": None,
+    },
+}
+
+
 @pytest.mark.asyncio
 async def test_ra3_device_list(ra3_bridge: Bridge):
     """Test methods getting devices."""
     devices = ra3_bridge.target.get_devices()
-    expected_devices = {
-        "1": {
-            "area": "83",
-            "button_groups": None,
-            "current_state": -1,
-            "device_id": "1",
-            "device_name": "Enclosure Device 001",
-            "fan_speed": None,
-            "model": "JanusProcRA3",
-            "name": "Equipment Room Enclosure Device 001",
-            "serial": 11111111,
-            "type": "RadioRa3Processor",
-            "zone": "1",
-        },
-        "1361": {
-            "area": "547",
-            "button_groups": None,
-            "current_state": 0,
-            "device_id": "1361",
-            "device_name": "Vanities",
-            "fan_speed": None,
-            "model": None,
-            "name": "Primary Bath_Vanities",
-            "serial": None,
-            "tilt": None,
-            "type": "Dimmed",
-            "zone": "1361",
-            "white_tuning_range": None,
-        },
-        "1377": {
-            "area": "547",
-            "button_groups": None,
-            "current_state": 0,
-            "device_id": "1377",
-            "device_name": "Shower & Tub",
-            "fan_speed": None,
-            "model": None,
-            "name": "Primary Bath_Shower & Tub",
-            "serial": None,
-            "tilt": None,
-            "type": "Dimmed",
-            "zone": "1377",
-            "white_tuning_range": None,
-        },
-        "1393": {
-            "area": "547",
-            "button_groups": None,
-            "current_state": 0,
-            "device_id": "1393",
-            "device_name": "Vent",
-            "fan_speed": None,
-            "model": None,
-            "name": "Primary Bath_Vent",
-            "serial": None,
-            "tilt": None,
-            "type": "Switched",
-            "zone": "1393",
-            "white_tuning_range": None,
-        },
-        "1488": {
-            "area": "547",
-            "button_groups": ["1491"],
-            "control_station_name": "Entry",
-            "current_state": -1,
-            "device_id": "1488",
-            "device_name": "Audio Pico",
-            "fan_speed": None,
-            "model": "PJ2-3BRL-XXX-A02",
-            "name": "Primary Bath_Entry Audio Pico Pico",
-            "serial": None,
-            "type": "Pico3ButtonRaiseLower",
-            "zone": None,
-        },
-        "2010": {
-            "area": "2796",
-            "button_groups": None,
-            "current_state": 0,
-            "device_id": "2010",
-            "device_name": "Porch",
-            "fan_speed": None,
-            "model": None,
-            "name": "Porch_Porch",
-            "serial": None,
-            "tilt": None,
-            "type": "Dimmed",
-            "zone": "2010",
-            "white_tuning_range": None,
-        },
-        "2091": {
-            "area": "766",
-            "button_groups": None,
-            "current_state": 0,
-            "device_id": "2091",
-            "device_name": "Overhead",
-            "fan_speed": None,
-            "model": None,
-            "name": "Entry_Overhead",
-            "serial": None,
-            "tilt": None,
-            "type": "Dimmed",
-            "zone": "2091",
-            "white_tuning_range": None,
-        },
-        "2107": {
-            "area": "766",
-            "button_groups": None,
-            "current_state": 0,
-            "device_id": "2107",
-            "device_name": "Landscape",
-            "fan_speed": None,
-            "model": None,
-            "name": "Entry_Landscape",
-            "serial": None,
-            "tilt": None,
-            "type": "Dimmed",
-            "zone": "2107",
-            "white_tuning_range": None,
-        },
-        "2139": {
-            "area": "766",
-            "button_groups": ["2148"],
-            "control_station_name": "Entry by Living Room",
-            "current_state": -1,
-            "device_id": "2139",
-            "device_name": "Scene Keypad",
-            "fan_speed": None,
-            "model": "RRST-W4B-XX",
-            "name": "Entry_Entry by Living Room Scene Keypad Keypad",
-            "serial": None,
-            "type": "SunnataKeypad",
-            "zone": None,
-        },
-        "2144": {
-            "current_state": -1,
-            "device_id": "2144",
-            "device_name": "Bright LED",
-            "fan_speed": None,
-            "model": "KeypadLED",
-            "name": "Entry_Entry by Living Room Scene Keypad Keypad Bright LED",
-            "parent_device": "2139",
-            "serial": None,
-            "type": "KeypadLED",
-            "zone": None,
-        },
-        "2145": {
-            "current_state": -1,
-            "device_id": "2145",
-            "device_name": "Entertain LED",
-            "fan_speed": None,
-            "model": "KeypadLED",
-            "name": "Entry_Entry by Living Room Scene Keypad Keypad Entertain LED",
-            "parent_device": "2139",
-            "serial": None,
-            "type": "KeypadLED",
-            "zone": None,
-        },
-        "2146": {
-            "current_state": -1,
-            "device_id": "2146",
-            "device_name": "Dining LED",
-            "fan_speed": None,
-            "model": "KeypadLED",
-            "name": "Entry_Entry by Living Room Scene Keypad Keypad Dining LED",
-            "parent_device": "2139",
-            "serial": None,
-            "type": "KeypadLED",
-            "zone": None,
-        },
-        "2147": {
-            "current_state": -1,
-            "device_id": "2147",
-            "device_name": "Off LED",
-            "fan_speed": None,
-            "model": "KeypadLED",
-            "name": "Entry_Entry by Living Room Scene Keypad Keypad Off LED",
-            "parent_device": "2139",
-            "serial": None,
-            "type": "KeypadLED",
-            "zone": None,
-        },
-        "2171": {
-            "area": "766",
-            "button_groups": ["2180"],
-            "control_station_name": "Entry by Living Room",
-            "current_state": -1,
-            "device_id": "2171",
-            "device_name": "Fan Keypad",
-            "fan_speed": None,
-            "model": "RRST-W4B-XX",
-            "name": "Entry_Entry by Living Room Fan Keypad Keypad",
-            "serial": None,
-            "type": "SunnataKeypad",
-            "zone": None,
-        },
-        "2176": {
-            "current_state": -1,
-            "device_id": "2176",
-            "device_name": "Fan High LED",
-            "fan_speed": None,
-            "model": "KeypadLED",
-            "name": "Entry_Entry by Living Room Fan Keypad Keypad Fan High LED",
-            "parent_device": "2171",
-            "serial": None,
-            "type": "KeypadLED",
-            "zone": None,
-        },
-        "2177": {
-            "current_state": -1,
-            "device_id": "2177",
-            "device_name": "Medium LED",
-            "fan_speed": None,
-            "model": "KeypadLED",
-            "name": "Entry_Entry by Living Room Fan Keypad Keypad Medium LED",
-            "parent_device": "2171",
-            "serial": None,
-            "type": "KeypadLED",
-            "zone": None,
-        },
-        "2178": {
-            "current_state": -1,
-            "device_id": "2178",
-            "device_name": "Low LED",
-            "fan_speed": None,
-            "model": "KeypadLED",
-            "name": "Entry_Entry by Living Room Fan Keypad Keypad Low LED",
-            "parent_device": "2171",
-            "serial": None,
-            "type": "KeypadLED",
-            "zone": None,
-        },
-        "2179": {
-            "current_state": -1,
-            "device_id": "2179",
-            "device_name": "Off LED",
-            "fan_speed": None,
-            "model": "KeypadLED",
-            "name": "Entry_Entry by Living Room Fan Keypad Keypad Off LED",
-            "parent_device": "2171",
-            "serial": None,
-            "type": "KeypadLED",
-            "zone": None,
-        },
-        "2939": {
-            "area": "547",
-            "button_groups": ["2942"],
-            "control_station_name": "Vanity",
-            "current_state": -1,
-            "device_id": "2939",
-            "device_name": "Audio Pico",
-            "fan_speed": None,
-            "model": "PJ2-3BRL-XXX-A02",
-            "name": "Primary Bath_Vanity Audio Pico Pico",
-            "serial": None,
-            "type": "Pico3ButtonRaiseLower",
-            "zone": None,
-        },
-        "5341": {
-            "area": "83",
-            "button_groups": ["5344"],
-            "control_station_name": "TestingPico",
-            "current_state": -1,
-            "device_id": "5341",
-            "device_name": "TestingPicoDev",
-            "fan_speed": None,
-            "model": "PJ2-3BRL-XXX-L01",
-            "name": "Equipment Room_TestingPico TestingPicoDev Pico",
-            "serial": 68130838,
-            "type": "Pico3ButtonRaiseLower",
-            "zone": None,
-        },
-        "536": {
-            "area": "83",
-            "button_groups": None,
-            "current_state": 0,
-            "device_id": "536",
-            "device_name": "Overhead",
-            "fan_speed": None,
-            "model": None,
-            "name": "Equipment Room_Overhead",
-            "serial": None,
-            "tilt": None,
-            "type": "Switched",
-            "zone": "536",
-            "white_tuning_range": None,
-        },
-    }
-
-    assert devices == expected_devices
+    assert devices == _EXPECTED_RA3_DEVICES
 
-    ra3_bridge.leap.send_unsolicited(
-        Response(
-            CommuniqueType="ReadResponse",
-            Header=ResponseHeader(
-                MessageBodyType="OneZoneStatus",
-                StatusCode=ResponseStatus(200, "OK"),
-                Url="/zone/1377/status",
-            ),
-            Body={"ZoneStatus": {"Level": 100, "Zone": {"href": "/zone/1377"}}},
-        )
-    )
+    ra3_bridge.leap.send_unsolicited(_zone_status_response("1377", {"Level": 100}))
 
     devices = ra3_bridge.target.get_devices()
     assert devices["1377"]["current_state"] == 100
@@ -1966,18 +1877,19 @@ async def test_ra3_device_list(ra3_bridge: Bridge):
     await ra3_bridge.target.close()
 
 
+_EXPECTED_RA3_AREAS = {
+    "3": {"id": "3", "name": "Home", "parent_id": None},
+    "2796": {"id": "2796", "name": "Porch", "parent_id": "3"},
+    "547": {"id": "547", "name": "Primary Bath", "parent_id": "3"},
+    "766": {"id": "766", "name": "Entry", "parent_id": "3"},
+    "83": {"id": "83", "name": "Equipment Room", "parent_id": "3"},
+}
+
+
 @pytest.mark.asyncio
 async def test_ra3_area_list(ra3_bridge: Bridge):
     """Test the list of areas loaded by the bridge."""
-    expected_areas = {
-        "3": {"id": "3", "name": "Home", "parent_id": None},
-        "2796": {"id": "2796", "name": "Porch", "parent_id": "3"},
-        "547": {"id": "547", "name": "Primary Bath", "parent_id": "3"},
-        "766": {"id": "766", "name": "Entry", "parent_id": "3"},
-        "83": {"id": "83", "name": "Equipment Room", "parent_id": "3"},
-    }
-
-    assert ra3_bridge.target.areas == expected_areas
+    assert ra3_bridge.target.areas == _EXPECTED_RA3_AREAS
     await ra3_bridge.target.close()
 
 
@@ -2039,31 +1951,11 @@ async def test_ra3_button_status_change_notification(ra3_bridge: Bridge):
 @pytest.mark.asyncio
 async def test_ra3_is_on(ra3_bridge: Bridge):
     """Test the is_on method returns device state."""
-    ra3_bridge.leap.send_unsolicited(
-        Response(
-            CommuniqueType="ReadResponse",
-            Header=ResponseHeader(
-                MessageBodyType="OneZoneStatus",
-                StatusCode=ResponseStatus(200, "OK"),
-                Url="/zone/2107/status",
-            ),
-            Body={"ZoneStatus": {"Level": 50, "Zone": {"href": "/zone/2107"}}},
-        )
-    )
+    ra3_bridge.leap.send_unsolicited(_zone_status_response("2107", {"Level": 50}))
 
     assert ra3_bridge.target.is_on("2107") is True
 
-    ra3_bridge.leap.send_unsolicited(
-        Response(
-            CommuniqueType="ReadResponse",
-            Header=ResponseHeader(
-                MessageBodyType="OneZoneStatus",
-                StatusCode=ResponseStatus(200, "OK"),
-                Url="/zone/2107/status",
-            ),
-            Body={"ZoneStatus": {"Level": 0, "Zone": {"href": "/zone/2107"}}},
-        )
-    )
+    ra3_bridge.leap.send_unsolicited(_zone_status_response("2107", {"Level": 0}))
 
     assert ra3_bridge.target.is_on("2107") is False
     await ra3_bridge.target.close()
@@ -2072,103 +1964,7 @@ async def test_ra3_is_on(ra3_bridge: Bridge):
 @pytest.mark.asyncio
 async def test_ra3_set_value(ra3_bridge: Bridge):
     """Test that setting values produces the right commands."""
-    task = asyncio.get_running_loop().create_task(
-        ra3_bridge.target.set_value("2107", 50)
-    )
-    command, response = await ra3_bridge.leap.requests.get()
-    assert command == Request(
-        communique_type="CreateRequest",
-        url="/zone/2107/commandprocessor",
-        body={
-            "Command": {
-                "CommandType": "GoToLevel",
-                "Parameter": [{"Type": "Level", "Value": 50}],
-            }
-        },
-    )
-    response.set_result(
-        Response(
-            CommuniqueType="CreateResponse",
-            Header=ResponseHeader(
-                MessageBodyType="OneZoneStatus",
-                StatusCode=ResponseStatus(201, "Created"),
-                Url="/zone/2107/commandprocessor",
-            ),
-            Body={
-                "ZoneStatus": {
-                    "href": "/zone/2107/status",
-                    "Level": 50,
-                    "Zone": {"href": "/zone/2107"},
-                }
-            },
-        )
-    )
-    ra3_bridge.leap.requests.task_done()
-    await task
-
-    task = asyncio.get_running_loop().create_task(ra3_bridge.target.turn_on("2107"))
-    command, response = await ra3_bridge.leap.requests.get()
-    assert command == Request(
-        communique_type="CreateRequest",
-        url="/zone/2107/commandprocessor",
-        body={
-            "Command": {
-                "CommandType": "GoToLevel",
-                "Parameter": [{"Type": "Level", "Value": 100}],
-            }
-        },
-    )
-    response.set_result(
-        Response(
-            CommuniqueType="CreateResponse",
-            Header=ResponseHeader(
-                MessageBodyType="OneZoneStatus",
-                StatusCode=ResponseStatus(201, "Created"),
-                Url="/zone/2107/commandprocessor",
-            ),
-            Body={
-                "ZoneStatus": {
-                    "href": "/zone/2107/status",
-                    "Level": 100,
-                    "Zone": {"href": "/zone/2107"},
-                }
-            },
-        ),
-    )
-    ra3_bridge.leap.requests.task_done()
-    await task
-
-    task = asyncio.get_running_loop().create_task(ra3_bridge.target.turn_off("2107"))
-    command, response = await ra3_bridge.leap.requests.get()
-    assert command == Request(
-        communique_type="CreateRequest",
-        url="/zone/2107/commandprocessor",
-        body={
-            "Command": {
-                "CommandType": "GoToLevel",
-                "Parameter": [{"Type": "Level", "Value": 0}],
-            }
-        },
-    )
-    response.set_result(
-        Response(
-            CommuniqueType="CreateResponse",
-            Header=ResponseHeader(
-                MessageBodyType="OneZoneStatus",
-                StatusCode=ResponseStatus(201, "Created"),
-                Url="/zone/2107/commandprocessor",
-            ),
-            Body={
-                "ZoneStatus": {
-                    "href": "/zone/2107/status",
-                    "Level": 0,
-                    "Zone": {"href": "/zone/2107"},
-                }
-            },
-        ),
-    )
-    ra3_bridge.leap.requests.task_done()
-    await task
+    await _check_level_commands(ra3_bridge, "2107", "2107")
     await ra3_bridge.target.close()
 
 
@@ -2277,6 +2073,23 @@ async def test_qsx_set_whitetune_temperature(qsx_processor: Bridge):
     )
     qsx_processor.leap.requests.task_done()
     task.cancel()
+
+    task = asyncio.get_running_loop().create_task(
+        qsx_processor.target.set_warm_dim("989", False)
+    )
+    command, _ = await qsx_processor.leap.requests.get()
+    assert command == Request(
+        communique_type="CreateRequest",
+        url="/zone/989/commandprocessor",
+        body={
+            "Command": {
+                "CommandType": "GoToWarmDim",
+                "WarmDimParameters": {"CurveDimming": None},
+            }
+        },
+    )
+    qsx_processor.leap.requests.task_done()
+    task.cancel()
     await qsx_processor.target.close()
 
 
@@ -2526,7 +2339,8 @@ async def test_qsx_button_led_notification(qsx_processor: Bridge):
             },
         )
     )
-    await asyncio.wait_for(qsx_processor.leap.requests.join(), 10)
+    async with asyncio_timeout(10):
+        await qsx_processor.leap.requests.join()
     assert notified
 
 